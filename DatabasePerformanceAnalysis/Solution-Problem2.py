@@ -1,31 +1,14 @@
-import pandas as pd
+import os
 import matplotlib.pyplot as plt
-import re
-from collections import Counter
-import pyodbc
-from azure.identity import DefaultAzureCredential
-import struct
+from db_pool import create_azure_pool
+from query_store_cache import QueryStoreCache
+from query_fingerprint import FingerprintAggregator
+from catalog_linter import CatalogLinter, write_report
 
 
-# Azure SQL Database connection details
-connection_string = 'Driver={ODBC Driver 17 for SQL Server};Server=tcp:nonprod-sql.workforceoptimizer.com,1433;Database=Candidate_DB;Encrypt=yes;TrustServerCertificate=yes;Connection Timeout=30'
-
-# Create a DB connection
-def create_connection():
-    credential = DefaultAzureCredential(exclude_interactive_browser_credential=False)
-    token_bytes = credential.get_token("https://database.windows.net/.default").token.encode("UTF-16-LE")
-    token_struct = struct.pack(f'<I{len(token_bytes)}s', len(token_bytes), token_bytes)
-    SQL_COPT_SS_ACCESS_TOKEN = 1256  # This connection option is defined by microsoft in msodbcsql.h
-    conn = pyodbc.connect(connection_string, attrs_before={SQL_COPT_SS_ACCESS_TOKEN: token_struct})
-    return conn
-
-conn = create_connection()
-
-# 1. Visualize tables size
-def visualize_table_sizes():
-    query = """
+TABLE_SIZES_QUERY = """
     SELECT TOP 20
-        (s.Name + '.'+ t.name) AS TableName,
+        CONCAT(s.Name, '.', t.name) AS TableName,
         (SUM(a.total_pages) * 8) / 1024 AS TotalSpaceMB, 
         (SUM(a.used_pages) * 8) / 1024 AS UsedSpaceMB, 
         ((SUM(a.total_pages) - SUM(a.used_pages)) * 8) /1024 AS UnusedSpaceMB
@@ -44,8 +27,14 @@ def visualize_table_sizes():
     ORDER BY 
         TotalSpaceMB DESC;
     """
-    
-    df = pd.read_sql(query, conn)
+
+# The catalog queries, the catalog lint and the Query Store snapshot refresh are independent, they run concurrently on the pool
+CATALOG_QUERIES = {
+    'table_sizes': TABLE_SIZES_QUERY,
+}
+
+# 1. Visualize tables size
+def visualize_table_sizes(df, output_dir='.'):
     df_sorted = df.sort_values('TotalSpaceMB', ascending=True)
     # Create horizontal bar chart
     fig, ax = plt.subplots(figsize=(12, 10))
@@ -63,110 +52,58 @@ def visualize_table_sizes():
         ax.text(v, i, f' {v:.2f}MB', va='center')
     
     # plt.tight_layout()
-    fig.savefig('Output_1-viz_table_sizes.png')
+    fig.savefig(os.path.join(output_dir, 'Output_1-viz_table_sizes.png'))
     # plt.show()
     # Save the plot to a png file
+    plt.close(fig)
 
-# 2. List tables not following the Snake_Pascal_Case naming convention
-def list_non_standard_tables():
-    query = "SELECT name FROM sys.tables"
-    df = pd.read_sql(query, conn)
-    
-    def is_snake_pascal_case(name):
-        return re.match(r'^([A-Z][a-z0-9]+)(_[A-Z][a-z0-9]+)*$', name) is not None
-    
-    non_standard_tables = [name for name in df['name'] if not is_snake_pascal_case(name)]
+# 2. List tables, and every other schema object, not following the Snake_Pascal_Case naming convention
+def list_non_standard_tables(violations, output_dir='.'):
+    non_standard_tables = violations.loc[violations['object_type'] == 'USER_TABLE', 'object_name'].sort_values()
     
     # Output the non-standard tables to text file
-    with open('Output_2-non_standard_tables.txt', 'w') as f:
+    with open(os.path.join(output_dir, 'Output_2-non_standard_tables.txt'), 'w') as f:
         for table in non_standard_tables:
             f.write(table + '\n')
 
+    # Output every non-standard object grouped by object type and schema
+    write_report(violations, os.path.join(output_dir, 'Output_2-non_standard_objects.txt'))
+
 
 # 3. Aggregate query text across the three Query Store queries
-def aggregate_query_store_queries():   
-    # Queries for Problem 1
-    long_running_query = """
-        SELECT TOP 15
-            q.query_id,
-            qt.query_sql_text,
-            rs.avg_duration / 1000 AS avg_duration_ms,
-            rs.max_duration / 1000 AS max_duration_ms,
-            rs.min_duration / 1000 AS min_duration_ms,
-            rs.count_executions
-        FROM 
-            sys.query_store_query q
-        JOIN 
-            sys.query_store_query_text qt ON q.query_text_id = qt.query_text_id
-        JOIN 
-            sys.query_store_plan p ON q.query_id = p.query_id
-        JOIN 
-            sys.query_store_runtime_stats rs ON p.plan_id = rs.plan_id
-        ORDER BY 
-            rs.avg_duration DESC
-    """
+def aggregate_query_store_queries(query_store_cache, output_dir='.', top=15, chunksize=10000, key_column=None):
+    # Stream the three lists in chunks, queries are grouped by SQL fingerprint (literals, whitespace and
+    # comments stripped) or by `key_column`, e.g. 'query_hash', instead of the exact text
+    aggregator = FingerprintAggregator(key_column)
+    aggregator.add('long_running', query_store_cache.top_long_running(top, chunksize=chunksize))
+    aggregator.add('most_executed', query_store_cache.top_most_executed(top, chunksize=chunksize))
+    aggregator.add('multiple_plans', query_store_cache.top_multiple_plans(top, chunksize=chunksize))
     
-    most_executed_query = """
-        SELECT TOP 15
-            q.query_id,
-            qt.query_sql_text,
-            SUM(rs.count_executions) AS total_executions,
-            AVG(rs.avg_duration) / 1000000 AS avg_duration_seconds
-        FROM 
-            sys.query_store_query q
-        JOIN 
-            sys.query_store_query_text qt ON q.query_text_id = qt.query_text_id
-        JOIN 
-            sys.query_store_plan p ON q.query_id = p.query_id
-        JOIN 
-            sys.query_store_runtime_stats rs ON p.plan_id = rs.plan_id
-        GROUP BY 
-            q.query_id, qt.query_sql_text
-        ORDER BY 
-            total_executions DESC
+    # Output queries that appear more than once to text file
+    with open(os.path.join(output_dir, 'Output_3-query_counts.txt'), 'w') as f:
+        for _, count, _, query in aggregator.results(min_occurrences=2):
+            f.write(str(count) + ';' + query.replace("\n", "") + '\n')
+
+def run_analysis(pool, output_dir='.', cache_path='query_store_cache.db', lint_state_path='catalog_lint.db'):
     """
-    
-    multiple_plans_query = """
-        SELECT TOP 15
-            q.query_id,
-            qt.query_sql_text,
-            COUNT(DISTINCT p.plan_id) AS plan_count
-        FROM 
-            sys.query_store_query q
-        INNER JOIN 
-            sys.query_store_query_text qt ON q.query_text_id = qt.query_text_id
-        JOIN 
-            sys.query_store_plan p ON q.query_id = p.query_id
-        GROUP BY 
-            q.query_id, qt.query_sql_text
-        HAVING 
-            COUNT(DISTINCT p.plan_id) > 3
-        ORDER BY 
-            plan_count DESC
+    Run the catalog queries, the incremental catalog lint and the incremental Query Store snapshot refresh
+    concurrently on the pool, then write the outputs. The Query Store analyses run locally against the snapshot.
     """
-    
-    top_15_long_running = pd.read_sql(long_running_query, conn)
-    top_15_most_executed = pd.read_sql(most_executed_query, conn)
-    top_15_multiple_plans = pd.read_sql(multiple_plans_query, conn)
-        
-    # Combine all query texts
-    all_queries = (
-        list(top_15_long_running['query_sql_text']) +
-        list(top_15_most_executed['query_sql_text']) +
-        list(top_15_multiple_plans['query_sql_text'])
-    )
-    
-    # Count occurrences
-    query_counts = Counter(all_queries)
-    
-    # Output queries that appear more than once to text file
-    with open('Output_3-query_counts.txt', 'w') as f:
-        for query, count in query_counts.items():
-            if count > 1:
-                f.write(str(count) + ';' + query.replace("\n", "") + '\n')
+    catalog_linter = CatalogLinter(lint_state_path)
+    query_store_cache = QueryStoreCache(cache_path)
+    results = pool.read_many({
+        **CATALOG_QUERIES,
+        'catalog_objects': catalog_linter.catalog_query(),
+        **query_store_cache.incremental_queries(),
+    })
+    query_store_cache.apply(results)
+    linted_objects = catalog_linter.apply(results['catalog_objects'])
+    visualize_table_sizes(results['table_sizes'], output_dir)
+    list_non_standard_tables(catalog_linter.violations(linted_objects), output_dir)
+    aggregate_query_store_queries(query_store_cache, output_dir)
+
 
 # Run the functions
-visualize_table_sizes()
-list_non_standard_tables()
-aggregate_query_store_queries()
-conn.close()
\ No newline at end of file
+if __name__ == '__main__':
+    with create_azure_pool() as pool:
+        run_analysis(pool)
@@ -0,0 +1,160 @@
+import re
+import sqlite3
+from contextlib import contextmanager
+import pandas as pd
+
+
+SNAKE_PASCAL_CASE = re.compile(r'^([A-Z][a-z0-9]+)(_[A-Z][a-z0-9]+)*$')
+
+# Every named schema object in one catalog query. `owner_object_id` is the table, view or procedure the object
+# belongs to, columns, indexes and constraints are re-linted with their owner. Names generated by SQL Server
+# (unnamed constraints, indexes of table types) are left out, nobody chose them.
+CATALOG_OBJECTS_QUERY = """
+    SELECT owner_object_id, object_type, schema_name, parent_name, object_name, modify_date
+    FROM (
+        SELECT
+            o.object_id AS owner_object_id,
+            o.type_desc AS object_type,
+            s.name AS schema_name,
+            CAST(NULL AS NVARCHAR(128)) AS parent_name,
+            o.name AS object_name,
+            o.modify_date
+        FROM sys.objects o
+        JOIN sys.schemas s ON o.schema_id = s.schema_id
+        WHERE o.is_ms_shipped = 0 AND o.parent_object_id = 0 AND o.type IN ('U', 'V', 'P', 'FN', 'IF', 'TF', 'TR')
+        UNION ALL
+        SELECT o.parent_object_id, o.type_desc, s.name, po.name, o.name, o.modify_date
+        FROM sys.objects o
+        JOIN sys.objects po ON o.parent_object_id = po.object_id
+        JOIN sys.schemas s ON o.schema_id = s.schema_id
+        LEFT JOIN sys.key_constraints kc ON o.object_id = kc.object_id
+        LEFT JOIN sys.default_constraints dc ON o.object_id = dc.object_id
+        LEFT JOIN sys.check_constraints cc ON o.object_id = cc.object_id
+        LEFT JOIN sys.foreign_keys fk ON o.object_id = fk.object_id
+        WHERE o.is_ms_shipped = 0 AND o.type IN ('PK', 'UQ', 'F', 'C', 'D', 'TR')
+          AND COALESCE(kc.is_system_named, dc.is_system_named, cc.is_system_named, fk.is_system_named, 0) = 0
+        UNION ALL
+        SELECT o.object_id, 'COLUMN', s.name, o.name, c.name, o.modify_date
+        FROM sys.columns c
+        JOIN sys.objects o ON c.object_id = o.object_id
+        JOIN sys.schemas s ON o.schema_id = s.schema_id
+        WHERE o.is_ms_shipped = 0 AND o.type IN ('U', 'V')
+        UNION ALL
+        SELECT o.object_id, 'INDEX', s.name, o.name, i.name, o.modify_date
+        FROM sys.indexes i
+        JOIN sys.objects o ON i.object_id = o.object_id
+        JOIN sys.schemas s ON o.schema_id = s.schema_id
+        WHERE o.is_ms_shipped = 0 AND o.type IN ('U', 'V') AND i.name IS NOT NULL AND i.is_primary_key = 0 AND i.is_unique_constraint = 0
+    ) catalog_objects
+"""
+
+# Incremental runs only pull the owners modified since the watermark, or having a modified child object
+CHANGED_OWNERS_FILTER = """
+    WHERE owner_object_id IN (
+        SELECT object_id FROM sys.objects WHERE parent_object_id = 0 AND modify_date > ?
+        UNION
+        SELECT parent_object_id FROM sys.objects WHERE parent_object_id <> 0 AND modify_date > ?
+    )
+"""
+
+STATE_DDL = """
+CREATE TABLE IF NOT EXISTS watermarks (name TEXT PRIMARY KEY, value TEXT);
+"""
+
+
+def lint_names(df):
+    """Flag the names following the Snake_Pascal_Case convention, vectorized over the whole catalog."""
+    df = df.copy()
+    df['is_standard'] = df['object_name'].str.match(SNAKE_PASCAL_CASE, na=False)
+    return df
+
+
+def summarize(violations):
+    """Count the non-standard names per object type and schema."""
+    return (violations.groupby(['object_type', 'schema_name']).size()
+            .rename('violations').reset_index()
+            .sort_values(['object_type', 'schema_name'], ignore_index=True))
+
+
+def write_report(violations, path):
+    """Write the non-standard names grouped by object type and schema."""
+    with open(path, 'w') as f:
+        for (object_type, schema_name), group in violations.groupby(['object_type', 'schema_name'], sort=True):
+            f.write(f'[{object_type}] {schema_name} ({len(group)})\n')
+            for parent_name, object_name in sorted(zip(group['parent_name'].fillna(''), group['object_name'])):
+                f.write(f'{parent_name}.{object_name}\n' if parent_name else f'{object_name}\n')
+            f.write('\n')
+
+
+class CatalogLinter:
+    """
+    Lints the names of every schema object in one catalog query.
+    The linted catalog is kept in a local SQLite file, re-runs only pull the objects modified since the last run.
+    Dropped objects are only removed by a full run (`full=True`).
+    """
+
+    def __init__(self, path):
+        self.path = str(path)
+        with self.connect() as conn:
+            conn.executescript(STATE_DDL)
+
+    @contextmanager
+    def connect(self):
+        """Open a connection to the local state, committed and closed on exit."""
+        conn = sqlite3.connect(self.path)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def watermark(self):
+        """Return the latest `modify_date` linted, None before the first run."""
+        with self.connect() as conn:
+            row = conn.execute("SELECT value FROM watermarks WHERE name = 'modify_date'").fetchone()
+        return None if row is None else pd.Timestamp(row[0]).to_pydatetime()
+
+    def catalog_query(self, full=False):
+        """Return the (query, params) pulling the objects to lint."""
+        since = None if full else self.watermark()
+        if since is None:
+            return CATALOG_OBJECTS_QUERY, None
+        return CATALOG_OBJECTS_QUERY + CHANGED_OWNERS_FILTER, (since, since)
+
+    def linted_objects(self):
+        """Return every linted object of the local state."""
+        with self.connect() as conn:
+            exists = conn.execute("SELECT 1 FROM sqlite_master WHERE name = 'catalog_objects'").fetchone()
+            if exists is None:
+                return None
+            df = pd.read_sql("SELECT * FROM catalog_objects", conn)
+        df['is_standard'] = df['is_standard'].astype(bool)
+        return df
+
+    def apply(self, df, full=False):
+        """Lint the pulled objects, replace the previous rows of their owners and store the result."""
+        df = lint_names(df)
+        df['modify_date'] = pd.to_datetime(df['modify_date'])
+        previous = None if full else self.linted_objects()
+        if previous is not None:
+            previous['modify_date'] = pd.to_datetime(previous['modify_date'])
+            previous = previous[~previous['owner_object_id'].isin(df['owner_object_id'])]
+            df = pd.concat([previous, df], ignore_index=True) if not df.empty else previous
+        with self.connect() as conn:
+            df.to_sql('catalog_objects', conn, if_exists='replace', index=False)
+            if not df.empty:
+                conn.execute(
+                    "INSERT OR REPLACE INTO watermarks (name, value) VALUES ('modify_date', ?)",
+                    (df['modify_date'].max().isoformat(sep=' '),),
+                )
+        return df
+
+    def run(self, pool, full=False):
+        """Pull the objects to lint from the pool and return every linted object."""
+        query, params = self.catalog_query(full)
+        return self.apply(pool.read_sql(query, params=params), full)
+
+    def violations(self, df=None):
+        """Return the objects whose name does not follow the convention."""
+        df = self.linted_objects() if df is None else df
+        return df[~df['is_standard']]
@@ -0,0 +1,92 @@
+import struct
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+import pandas as pd
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import URL, Engine
+
+
+# Azure SQL Database connection details
+CONNECTION_STRING = 'Driver={ODBC Driver 17 for SQL Server};Server=tcp:nonprod-sql.workforceoptimizer.com,1433;Database=Candidate_DB;Encrypt=yes;TrustServerCertificate=yes;Connection Timeout=30'
+AZURE_SQL_SCOPE = "https://database.windows.net/.default"
+SQL_COPT_SS_ACCESS_TOKEN = 1256  # This connection option is defined by microsoft in msodbcsql.h
+
+
+class AccessTokenCache:
+    """Caches an Azure access token and only asks the credential again shortly before it expires."""
+
+    def __init__(self, credential=None, scope=AZURE_SQL_SCOPE, refresh_margin_seconds=300):
+        self.credential = credential
+        self.scope = scope
+        self.refresh_margin_seconds = refresh_margin_seconds
+        self._access_token = None
+        self._lock = threading.Lock()
+
+    def get_token(self):
+        """Return a valid access token, refreshing it when it expires within the refresh margin."""
+        with self._lock:
+            if self._access_token is None or time.time() >= self._access_token.expires_on - self.refresh_margin_seconds:
+                if self.credential is None:
+                    from azure.identity import DefaultAzureCredential
+                    self.credential = DefaultAzureCredential(exclude_interactive_browser_credential=False)
+                self._access_token = self.credential.get_token(self.scope)
+            return self._access_token.token
+
+    def token_struct(self):
+        """Return the access token packed as expected by the SQL_COPT_SS_ACCESS_TOKEN ODBC attribute."""
+        token_bytes = self.get_token().encode("UTF-16-LE")
+        return struct.pack(f'<I{len(token_bytes)}s', len(token_bytes), token_bytes)
+
+
+class ConnectionPool:
+    """Runs queries on a pooled SQLAlchemy engine, independent queries run concurrently."""
+
+    def __init__(self, engine: Engine, max_workers=4):
+        self.engine = engine
+        self.max_workers = max_workers
+
+    def read_sql(self, query, **kwargs):
+        """Run a query on a pooled connection and return the result as a DataFrame."""
+        with self.engine.connect() as conn:
+            return pd.read_sql(query, conn, **kwargs)
+
+    def read_many(self, queries):
+        """
+        Run independent queries concurrently, `queries` maps a name to a query or to a (query, params) tuple.
+        The result maps the name to a DataFrame.
+        """
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            futures = {
+                name: executor.submit(self.read_sql, query[0], params=query[1]) if isinstance(query, tuple)
+                else executor.submit(self.read_sql, query)
+                for name, query in queries.items()
+            }
+            return {name: future.result() for name, future in futures.items()}
+
+    def dispose(self):
+        """Close every pooled connection."""
+        self.engine.dispose()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.dispose()
+
+
+def create_azure_pool(connection_string=CONNECTION_STRING, credential=None, pool_size=4, max_workers=4):
+    """Create a connection pool to Azure SQL Database authenticated with a cached Microsoft Entra ID access token."""
+    token_cache = AccessTokenCache(credential)
+    engine = create_engine(
+        URL.create("mssql+pyodbc", query={"odbc_connect": connection_string}),
+        pool_size=pool_size,
+        max_overflow=0,
+        pool_pre_ping=True,
+    )
+
+    @event.listens_for(engine, "do_connect")
+    def provide_token(dialect, conn_rec, cargs, cparams):
+        cparams["attrs_before"] = {SQL_COPT_SS_ACCESS_TOKEN: token_cache.token_struct()}
+
+    return ConnectionPool(engine, max_workers=max_workers)
@@ -0,0 +1,92 @@
+import hashlib
+import re
+
+
+# Comments and literals are matched in one left to right pass, so a comment marker inside a string literal stays
+# part of the literal and a quote inside a comment stays part of the comment.
+TOKEN_PATTERN = re.compile(
+    r"(?P<comment>--[^\n]*|/\*.*?\*/)"
+    r"|(?P<string>N?'(?:[^']|'')*')"
+    r"|(?P<hex>\b0x[0-9a-f]+\b)"
+    r"|(?P<number>(?<![\w@#$.])\d+(?:\.\d+)?(?:e[-+]?\d+)?\b)"
+    r"|(?P<variable>@\w+)",
+    re.IGNORECASE | re.DOTALL,
+)
+VALUE_LIST_PATTERN = re.compile(r'\(\s*\?(?:\s*,\s*\?)+\s*\)')
+WHITESPACE_PATTERN = re.compile(r'\s+')
+
+
+def strip_parameter_declaration(text):
+    """Remove the `(@1 int,@2 varchar(8000))` prefix that SQL Server adds to parameterized query texts."""
+    stripped = text.lstrip()
+    if not stripped.startswith('(@'):
+        return text
+    depth = 0
+    for position, char in enumerate(stripped):
+        if char == '(':
+            depth += 1
+        elif char == ')':
+            depth -= 1
+            if depth == 0:
+                return stripped[position + 1:]
+    return text
+
+
+def fingerprint_sql(text):
+    """
+    Normalize a query text so that queries differing only in literals, parameters, comments,
+    whitespace or keyword case get the same fingerprint.
+    """
+    text = strip_parameter_declaration(text)
+    text = TOKEN_PATTERN.sub(lambda match: ' ' if match.lastgroup == 'comment' else '?', text)
+    text = WHITESPACE_PATTERN.sub(' ', text).strip().lower()
+    return VALUE_LIST_PATTERN.sub('(?)', text)
+
+
+def fingerprint_hash(text):
+    """Return a short stable hash of the fingerprint of a query text."""
+    return hashlib.blake2b(fingerprint_sql(text).encode('utf-8'), digest_size=8).hexdigest()
+
+
+class FingerprintAggregator:
+    """
+    Aggregates query texts from several result lists streamed in chunks.
+    Rows are keyed on the fingerprint hash of `query_sql_text`, or on `key_column` (e.g. the server `query_hash`),
+    and only the counters and one sample text are kept per key, so memory is bounded by the number of distinct keys.
+    """
+
+    def __init__(self, key_column=None):
+        self.key_column = key_column
+        self.occurrences = {}
+        self.lists = {}
+        self.samples = {}
+
+    def key(self, row_key, text):
+        if self.key_column is None:
+            return fingerprint_hash(text)
+        return row_key.hex() if isinstance(row_key, bytes) else str(row_key)
+
+    def add_chunk(self, list_name, df):
+        """Add a chunk of rows of the given list."""
+        row_keys = df[self.key_column] if self.key_column is not None else df['query_sql_text']
+        for row_key, text in zip(row_keys, df['query_sql_text']):
+            key = self.key(row_key, text)
+            self.occurrences[key] = self.occurrences.get(key, 0) + 1
+            self.lists.setdefault(key, set()).add(list_name)
+            self.samples.setdefault(key, text)
+
+    def add(self, list_name, chunks):
+        """Add every chunk of a list, `chunks` is a DataFrame or an iterator of DataFrames."""
+        if hasattr(chunks, 'columns'):
+            chunks = [chunks]
+        for df in chunks:
+            self.add_chunk(list_name, df)
+
+    def results(self, min_occurrences=1, min_lists=1):
+        """Return (key, occurrences, list names, sample text) of the keys seen often enough, most frequent first."""
+        rows = [
+            (key, occurrences, sorted(self.lists[key]), self.samples[key])
+            for key, occurrences in self.occurrences.items()
+            if occurrences >= min_occurrences and len(self.lists[key]) >= min_lists
+        ]
+        return sorted(rows, key=lambda row: row[1], reverse=True)
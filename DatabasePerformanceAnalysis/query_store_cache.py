@@ -0,0 +1,225 @@
+import sqlite3
+from contextlib import contextmanager
+import pandas as pd
+
+
+# Local copy of the Query Store columns used by the analysis
+CACHE_DDL = """
+CREATE TABLE IF NOT EXISTS query_store_query_text (query_text_id INTEGER PRIMARY KEY, query_sql_text TEXT);
+CREATE TABLE IF NOT EXISTS query_store_query (query_id INTEGER PRIMARY KEY, query_text_id INTEGER, query_hash BLOB);
+CREATE TABLE IF NOT EXISTS query_store_plan (plan_id INTEGER PRIMARY KEY, query_id INTEGER);
+CREATE TABLE IF NOT EXISTS query_store_runtime_stats (
+    runtime_stats_id INTEGER PRIMARY KEY,
+    plan_id INTEGER,
+    runtime_stats_interval_id INTEGER,
+    count_executions INTEGER,
+    avg_duration REAL,
+    max_duration REAL,
+    min_duration REAL
+);
+CREATE INDEX IF NOT EXISTS ix_query_store_plan_query_id ON query_store_plan (query_id);
+CREATE INDEX IF NOT EXISTS ix_query_store_runtime_stats_plan_id ON query_store_runtime_stats (plan_id);
+CREATE TABLE IF NOT EXISTS watermarks (name TEXT PRIMARY KEY, value INTEGER);
+"""
+
+# Texts, queries and plans are append-only and keyed by increasing ids, only the ids above the watermark are pulled.
+# The runtime stats of the latest interval are still being aggregated by the server, so that interval is pulled again.
+INCREMENTAL_QUERIES = {
+    'query_store_query_text': (
+        "SELECT query_text_id, query_sql_text FROM sys.query_store_query_text WHERE query_text_id > {watermark}",
+        'query_text_id',
+    ),
+    'query_store_query': (
+        "SELECT query_id, query_text_id, query_hash FROM sys.query_store_query WHERE query_id > {watermark}",
+        'query_id',
+    ),
+    'query_store_plan': (
+        "SELECT plan_id, query_id FROM sys.query_store_plan WHERE plan_id > {watermark}",
+        'plan_id',
+    ),
+    'query_store_runtime_stats': (
+        """SELECT runtime_stats_id, plan_id, runtime_stats_interval_id, count_executions, avg_duration, max_duration, min_duration
+        FROM sys.query_store_runtime_stats WHERE runtime_stats_interval_id >= {watermark}""",
+        'runtime_stats_interval_id',
+    ),
+}
+
+# The server drops old runtime stats intervals by its retention policy (STALE_QUERY_THRESHOLD_DAYS) or size based cleanup.
+# The snapshot drops the same intervals, then the plans, queries and texts left without any runtime stats.
+OLDEST_INTERVAL_QUERY = "SELECT MIN(runtime_stats_interval_id) AS oldest_interval_id FROM sys.query_store_runtime_stats"
+
+RETENTION_STATEMENTS = [
+    ("expired_plans", "CREATE TEMP TABLE expired_plans AS SELECT DISTINCT plan_id FROM query_store_runtime_stats WHERE runtime_stats_interval_id < :oldest"),
+    ("query_store_runtime_stats", "DELETE FROM query_store_runtime_stats WHERE runtime_stats_interval_id < :oldest"),
+    ("expired_plans", "DELETE FROM expired_plans WHERE plan_id IN (SELECT plan_id FROM query_store_runtime_stats)"),
+    ("expired_queries", "CREATE TEMP TABLE expired_queries AS SELECT DISTINCT query_id FROM query_store_plan WHERE plan_id IN (SELECT plan_id FROM expired_plans)"),
+    ("query_store_plan", "DELETE FROM query_store_plan WHERE plan_id IN (SELECT plan_id FROM expired_plans)"),
+    ("expired_queries", "DELETE FROM expired_queries WHERE query_id IN (SELECT query_id FROM query_store_plan)"),
+    ("expired_texts", "CREATE TEMP TABLE expired_texts AS SELECT DISTINCT query_text_id FROM query_store_query WHERE query_id IN (SELECT query_id FROM expired_queries)"),
+    ("query_store_query", "DELETE FROM query_store_query WHERE query_id IN (SELECT query_id FROM expired_queries)"),
+    ("expired_texts", "DELETE FROM expired_texts WHERE query_text_id IN (SELECT query_text_id FROM query_store_query)"),
+    ("query_store_query_text", "DELETE FROM query_store_query_text WHERE query_text_id IN (SELECT query_text_id FROM expired_texts)"),
+]
+
+NO_LIMIT = -1  # SQLite returns every row for a negative LIMIT
+
+LONG_RUNNING_QUERY = """
+    SELECT
+        q.query_id,
+        q.query_hash,
+        qt.query_sql_text,
+        rs.avg_duration / 1000 AS avg_duration_ms,
+        rs.max_duration / 1000 AS max_duration_ms,
+        rs.min_duration / 1000 AS min_duration_ms,
+        rs.count_executions
+    FROM query_store_query q
+    JOIN query_store_query_text qt ON q.query_text_id = qt.query_text_id
+    JOIN query_store_plan p ON q.query_id = p.query_id
+    JOIN query_store_runtime_stats rs ON p.plan_id = rs.plan_id
+    ORDER BY rs.avg_duration DESC
+    LIMIT ?
+"""
+
+MOST_EXECUTED_QUERY = """
+    SELECT
+        q.query_id,
+        q.query_hash,
+        qt.query_sql_text,
+        SUM(rs.count_executions) AS total_executions,
+        AVG(rs.avg_duration) / 1000000 AS avg_duration_seconds
+    FROM query_store_query q
+    JOIN query_store_query_text qt ON q.query_text_id = qt.query_text_id
+    JOIN query_store_plan p ON q.query_id = p.query_id
+    JOIN query_store_runtime_stats rs ON p.plan_id = rs.plan_id
+    GROUP BY q.query_id, q.query_hash, qt.query_sql_text
+    ORDER BY total_executions DESC
+    LIMIT ?
+"""
+
+MULTIPLE_PLANS_QUERY = """
+    SELECT
+        q.query_id,
+        q.query_hash,
+        qt.query_sql_text,
+        COUNT(DISTINCT p.plan_id) AS plan_count
+    FROM query_store_query q
+    JOIN query_store_query_text qt ON q.query_text_id = qt.query_text_id
+    JOIN query_store_plan p ON q.query_id = p.query_id
+    GROUP BY q.query_id, q.query_hash, qt.query_sql_text
+    HAVING COUNT(DISTINCT p.plan_id) > ?
+    ORDER BY plan_count DESC
+    LIMIT ?
+"""
+
+
+class QueryStoreCache:
+    """
+    Local SQLite snapshot of the Query Store, refreshed incrementally from per-table watermarks.
+    The top-N analyses run against the snapshot, so repeat runs put almost no load on the server.
+    Each refresh also drops the runtime stats older than the oldest interval still on the server.
+    """
+
+    def __init__(self, path):
+        self.path = str(path)
+        with self.connect() as conn:
+            conn.executescript(CACHE_DDL)
+
+    @contextmanager
+    def connect(self):
+        """Open a connection to the snapshot, committed and closed on exit."""
+        conn = sqlite3.connect(self.path)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def watermarks(self):
+        """Return the watermark of every cached table, 0 when the table was never pulled."""
+        with self.connect() as conn:
+            stored = dict(conn.execute("SELECT name, value FROM watermarks").fetchall())
+        return {table: stored.get(table, 0) for table in INCREMENTAL_QUERIES}
+
+    def incremental_queries(self):
+        """
+        Return the server queries pulling the rows above the watermarks, keyed by cached table, and the query
+        reading the oldest interval kept by the server, keyed by 'oldest_interval'.
+        """
+        watermarks = self.watermarks()
+        queries = {
+            table: query.format(watermark=int(watermarks[table]))
+            for table, (query, _) in INCREMENTAL_QUERIES.items()
+        }
+        queries['oldest_interval'] = OLDEST_INTERVAL_QUERY
+        return queries
+
+    def apply(self, results):
+        """
+        Upsert the pulled rows, keyed by table, advance the watermarks and drop the intervals the server no longer has.
+        Returns the number of rows pulled per table.
+        """
+        pulled = {}
+        with self.connect() as conn:
+            for table, (_, watermark_column) in INCREMENTAL_QUERIES.items():
+                df = results[table]
+                pulled[table] = len(df)
+                if df.empty:
+                    continue
+                columns = list(df.columns)
+                conn.executemany(
+                    f"INSERT OR REPLACE INTO {table} ({', '.join(columns)}) VALUES ({', '.join('?' for _ in columns)})",
+                    df.astype(object).where(df.notna(), None).itertuples(index=False, name=None),
+                )
+                conn.execute(
+                    "INSERT INTO watermarks (name, value) VALUES (?, ?) "
+                    "ON CONFLICT (name) DO UPDATE SET value = MAX(value, excluded.value)",
+                    (table, int(df[watermark_column].max())),
+                )
+        oldest_interval_id = results['oldest_interval']['oldest_interval_id'].iloc[0]
+        if pd.notna(oldest_interval_id):  # An empty Query Store keeps the snapshot as is
+            self.apply_retention(oldest_interval_id)
+        return pulled
+
+    def apply_retention(self, oldest_interval_id):
+        """
+        Drop the runtime stats older than `oldest_interval_id`, then the plans, queries and texts that only had
+        dropped runtime stats. Returns the number of rows dropped per table.
+        """
+        dropped = {table: 0 for table in INCREMENTAL_QUERIES}
+        with self.connect() as conn:
+            for table, statement in RETENTION_STATEMENTS:
+                cursor = conn.execute(statement, {'oldest': int(oldest_interval_id)})
+                if table in dropped:
+                    dropped[table] = cursor.rowcount
+        return dropped
+
+    def refresh(self, pool):
+        """
+        Pull the new rows of every table concurrently on the pool, store them in the snapshot and drop the
+        intervals the server no longer has. Returns the number of rows pulled per table.
+        """
+        return self.apply(pool.read_many(self.incremental_queries()))
+
+    def read_sql(self, query, params, chunksize=None):
+        """Run a query on the snapshot, returning a DataFrame, or an iterator of DataFrames when `chunksize` is given."""
+        if chunksize is not None:
+            return self.read_sql_chunks(query, params, chunksize)
+        with self.connect() as conn:
+            return pd.read_sql(query, conn, params=params)
+
+    def read_sql_chunks(self, query, params, chunksize):
+        with self.connect() as conn:
+            yield from pd.read_sql(query, conn, params=params, chunksize=chunksize)
+
+    # For the top-N analyses, `top=None` returns every row and `chunksize` streams the rows in chunks
+    def top_long_running(self, top=15, chunksize=None):
+        """Plans with the longest average duration."""
+        return self.read_sql(LONG_RUNNING_QUERY, (NO_LIMIT if top is None else top,), chunksize)
+
+    def top_most_executed(self, top=15, chunksize=None):
+        """Queries with the most executions."""
+        return self.read_sql(MOST_EXECUTED_QUERY, (NO_LIMIT if top is None else top,), chunksize)
+
+    def top_multiple_plans(self, top=15, min_plans=3, chunksize=None):
+        """Queries with more than `min_plans` plans."""
+        return self.read_sql(MULTIPLE_PLANS_QUERY, (min_plans, NO_LIMIT if top is None else top), chunksize)
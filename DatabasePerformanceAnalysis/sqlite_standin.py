@@ -0,0 +1,184 @@
+import re
+import sqlite3
+from datetime import datetime
+from sqlalchemy import create_engine, event
+from sqlalchemy.pool import QueuePool
+from db_pool import ConnectionPool
+
+
+# Subset of the SQL Server catalog views used by the analysis, attached to every connection as the `sys` schema
+CATALOG_DDL = """
+CREATE TABLE IF NOT EXISTS sys.schemas (schema_id INTEGER PRIMARY KEY, name TEXT);
+CREATE TABLE IF NOT EXISTS sys.tables (object_id INTEGER PRIMARY KEY, name TEXT, schema_id INTEGER);
+CREATE TABLE IF NOT EXISTS sys.indexes (object_id INTEGER, index_id INTEGER, name TEXT, is_primary_key INTEGER DEFAULT 0, is_unique_constraint INTEGER DEFAULT 0);
+CREATE TABLE IF NOT EXISTS sys.objects (object_id INTEGER PRIMARY KEY, name TEXT, schema_id INTEGER, parent_object_id INTEGER DEFAULT 0, type TEXT, type_desc TEXT, is_ms_shipped INTEGER DEFAULT 0, modify_date TEXT);
+CREATE TABLE IF NOT EXISTS sys.key_constraints (object_id INTEGER PRIMARY KEY, is_system_named INTEGER DEFAULT 0);
+CREATE TABLE IF NOT EXISTS sys.default_constraints (object_id INTEGER PRIMARY KEY, is_system_named INTEGER DEFAULT 0);
+CREATE TABLE IF NOT EXISTS sys.check_constraints (object_id INTEGER PRIMARY KEY, is_system_named INTEGER DEFAULT 0);
+CREATE TABLE IF NOT EXISTS sys.foreign_keys (object_id INTEGER PRIMARY KEY, is_system_named INTEGER DEFAULT 0);
+CREATE TABLE IF NOT EXISTS sys.columns (object_id INTEGER, column_id INTEGER, name TEXT);
+CREATE TABLE IF NOT EXISTS sys.partitions (partition_id INTEGER PRIMARY KEY, object_id INTEGER, index_id INTEGER, rows INTEGER);
+CREATE TABLE IF NOT EXISTS sys.allocation_units (allocation_unit_id INTEGER PRIMARY KEY, container_id INTEGER, total_pages INTEGER, used_pages INTEGER);
+CREATE TABLE IF NOT EXISTS sys.query_store_query_text (query_text_id INTEGER PRIMARY KEY, query_sql_text TEXT);
+CREATE TABLE IF NOT EXISTS sys.query_store_query (query_id INTEGER PRIMARY KEY, query_text_id INTEGER, query_hash BLOB);
+CREATE TABLE IF NOT EXISTS sys.query_store_plan (plan_id INTEGER PRIMARY KEY, query_id INTEGER);
+CREATE TABLE IF NOT EXISTS sys.query_store_runtime_stats (runtime_stats_id INTEGER PRIMARY KEY, plan_id INTEGER, runtime_stats_interval_id INTEGER, count_executions INTEGER, avg_duration REAL, max_duration REAL, min_duration REAL);
+"""
+
+# Datetime parameters are stored as text, in the same format as the catalog dates of the stand-in
+sqlite3.register_adapter(datetime, lambda value: value.isoformat(sep=' '))
+
+TOP_PATTERN = re.compile(r'^\s*SELECT\s+TOP\s+(\d+)\s', re.IGNORECASE)
+
+
+def translate_tsql(statement):
+    """Rewrite the T-SQL constructs used by the analysis that SQLite does not support (`SELECT TOP n`)."""
+    match = TOP_PATTERN.match(statement)
+    if match is None:
+        return statement
+    body = statement[match.end():].rstrip().rstrip(';')
+    return f"SELECT {body} LIMIT {match.group(1)}"
+
+
+def concat(*values):
+    """T-SQL CONCAT: NULL values are treated as empty strings."""
+    return ''.join('' if value is None else str(value) for value in values)
+
+
+def create_sqlite_pool(catalog_path, pool_size=4, max_workers=4):
+    """
+    Create a connection pool standing in for Azure SQL Database, backed by a SQLite file holding the catalog views.
+    Every connection gets its own in-memory main database with the catalog file attached as `sys`.
+    """
+    engine = create_engine(
+        "sqlite://",
+        poolclass=QueuePool,
+        pool_size=pool_size,
+        max_overflow=0,
+        connect_args={"check_same_thread": False},
+    )
+
+    @event.listens_for(engine, "connect")
+    def attach_catalog(dbapi_connection, connection_record):
+        dbapi_connection.execute("ATTACH DATABASE ? AS sys", (str(catalog_path),))
+        dbapi_connection.create_function("CONCAT", -1, concat, deterministic=True)
+
+    @event.listens_for(engine, "before_cursor_execute", retval=True)
+    def rewrite_statement(conn, cursor, statement, parameters, context, executemany):
+        return translate_tsql(statement), parameters
+
+    pool = ConnectionPool(engine, max_workers=max_workers)
+    create_catalog(pool)
+    return pool
+
+
+def create_catalog(pool):
+    """Create the catalog views in the attached `sys` database if they do not exist yet."""
+    connection = pool.engine.raw_connection()
+    try:
+        connection.driver_connection.executescript(CATALOG_DDL)
+        connection.commit()
+    finally:
+        connection.close()
+
+
+def insert_rows(pool, table, rows):
+    """Insert rows, given as dicts, into a catalog view of the stand-in."""
+    if not rows:
+        return
+    columns = list(rows[0])
+    statement = f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({', '.join('?' for _ in columns)})"
+    connection = pool.engine.raw_connection()
+    try:
+        connection.cursor().executemany(statement, [tuple(row[column] for column in columns) for row in rows])
+        connection.commit()
+    finally:
+        connection.close()
+
+
+def seed_sample_catalog(pool):
+    """Fill the stand-in with a small deterministic database: a few tables and a Query Store with overlapping top queries."""
+    table_names = ['Staff_Group', 'Task_Workload', 'customers', 'date_table', 'UI_Tile', 'Ui_Tile_bak', 'Demand_Driver', 'PS_Answers']
+    insert_rows(pool, 'sys.schemas', [{'schema_id': 1, 'name': 'dbo'}])
+    insert_rows(pool, 'sys.tables', [
+        {'object_id': object_id, 'name': name, 'schema_id': 1} for object_id, name in enumerate(table_names, start=1)
+    ])
+    # Only the primary key of customers is named by hand, the others and the default constraint of Task_Workload are
+    # named by SQL Server. The table type has a system named index.
+    pk_names = {object_id: f'PK__{name[:8]}__3214EC07{object_id:08X}' for object_id, name in enumerate(table_names, start=1)}
+    pk_names[3] = 'PK_customers'
+    insert_rows(pool, 'sys.indexes', [
+        {'object_id': object_id, 'index_id': 1, 'name': pk_names[object_id], 'is_primary_key': 1}
+        for object_id in range(1, len(table_names) + 1)
+    ] + [
+        {'object_id': 3, 'index_id': 2, 'name': 'ix_customers_name', 'is_primary_key': 0},
+        {'object_id': 301, 'index_id': 2, 'name': 'IX_TT_Task_Ids_5A1B2C3D', 'is_primary_key': 0},
+    ])
+    modify_date = '2024-01-01 00:00:00'
+    insert_rows(pool, 'sys.objects', [
+        {'object_id': object_id, 'name': name, 'schema_id': 1, 'parent_object_id': 0, 'type': 'U', 'type_desc': 'USER_TABLE', 'modify_date': modify_date}
+        for object_id, name in enumerate(table_names, start=1)
+    ] + [
+        {'object_id': 100 + object_id, 'name': pk_names[object_id], 'schema_id': 1, 'parent_object_id': object_id, 'type': 'PK',
+         'type_desc': 'PRIMARY_KEY_CONSTRAINT', 'modify_date': modify_date}
+        for object_id in range(1, len(table_names) + 1)
+    ] + [
+        {'object_id': 111, 'name': 'DF_Staff_Group_Active', 'schema_id': 1, 'parent_object_id': 1, 'type': 'D',
+         'type_desc': 'DEFAULT_CONSTRAINT', 'modify_date': modify_date},
+        {'object_id': 112, 'name': 'DF__Task_Wor__Creat__1A2B3C4D', 'schema_id': 1, 'parent_object_id': 2, 'type': 'D',
+         'type_desc': 'DEFAULT_CONSTRAINT', 'modify_date': modify_date},
+        {'object_id': 201, 'name': 'Staff_Overview', 'schema_id': 1, 'parent_object_id': 0, 'type': 'V', 'type_desc': 'VIEW', 'modify_date': modify_date},
+        {'object_id': 202, 'name': 'usp_get_tasks', 'schema_id': 1, 'parent_object_id': 0, 'type': 'P', 'type_desc': 'SQL_STORED_PROCEDURE', 'modify_date': modify_date},
+        {'object_id': 301, 'name': 'TT_Task_Ids_5A1B2C3D', 'schema_id': 1, 'parent_object_id': 0, 'type': 'TT', 'type_desc': 'TYPE_TABLE', 'modify_date': modify_date},
+    ])
+    insert_rows(pool, 'sys.key_constraints', [
+        {'object_id': 100 + object_id, 'is_system_named': int(object_id != 3)} for object_id in range(1, len(table_names) + 1)
+    ])
+    insert_rows(pool, 'sys.default_constraints', [{'object_id': 111, 'is_system_named': 0}, {'object_id': 112, 'is_system_named': 1}])
+    insert_rows(pool, 'sys.columns', [
+        {'object_id': object_id, 'column_id': 1, 'name': 'Id'} for object_id in range(1, len(table_names) + 1)
+    ] + [
+        {'object_id': 3, 'column_id': 2, 'name': 'customer_name'},
+        {'object_id': 201, 'column_id': 1, 'name': 'Staff_Id'},
+    ])
+    insert_rows(pool, 'sys.partitions', [
+        {'partition_id': object_id, 'object_id': object_id, 'index_id': 1, 'rows': object_id * 1000}
+        for object_id in range(1, len(table_names) + 1)
+    ])
+    insert_rows(pool, 'sys.allocation_units', [
+        {'allocation_unit_id': object_id, 'container_id': object_id, 'total_pages': object_id * 1280, 'used_pages': object_id * 1024}
+        for object_id in range(1, len(table_names) + 1)
+    ])
+
+    query_texts = [
+        "SELECT * FROM Staff_Group WHERE Staff_Group_Id = @1",
+        "SELECT * FROM Task_Workload WHERE Task_Date >= @1",
+        "UPDATE customers SET name = @1 WHERE id = @2",
+        "SELECT COUNT(*) FROM date_table",
+        "DELETE FROM UI_Tile WHERE UI_Tile_Id = @1",
+    ]
+    insert_rows(pool, 'sys.query_store_query_text', [
+        {'query_text_id': query_id, 'query_sql_text': text} for query_id, text in enumerate(query_texts, start=1)
+    ])
+    insert_rows(pool, 'sys.query_store_query', [
+        {'query_id': query_id, 'query_text_id': query_id, 'query_hash': query_id.to_bytes(8, 'big')}
+        for query_id in range(1, len(query_texts) + 1)
+    ])
+    # Query i has i + 1 plans, so the last queries have more than 3 plans
+    plans = []
+    for query_id in range(1, len(query_texts) + 1):
+        for _ in range(query_id + 1):
+            plans.append({'plan_id': len(plans) + 1, 'query_id': query_id})
+    insert_rows(pool, 'sys.query_store_plan', plans)
+    insert_rows(pool, 'sys.query_store_runtime_stats', [
+        {
+            'runtime_stats_id': plan['plan_id'],
+            'plan_id': plan['plan_id'],
+            'runtime_stats_interval_id': 1,
+            'count_executions': 10 * plan['query_id'],
+            'avg_duration': 1000.0 * plan['query_id'] * plan['plan_id'],
+            'max_duration': 2000.0 * plan['query_id'] * plan['plan_id'],
+            'min_duration': 500.0 * plan['query_id'] * plan['plan_id'],
+        }
+        for plan in plans
+    ])
@@ -0,0 +1,283 @@
+import argparse
+import logging
+import os
+import sqlite3
+import time
+from contextlib import contextmanager
+from datetime import datetime
+import pandas as pd
+from matplotlib.figure import Figure
+
+
+# Size and row count of every table and index. Pages are summed per partition first so that rows are not
+# counted once per allocation unit.
+TABLE_SIZES_SAMPLE_QUERY = """
+    SELECT
+        s.name AS schema_name,
+        t.name AS table_name,
+        i.index_id,
+        COALESCE(i.name, 'HEAP') AS index_name,
+        SUM(p.rows) AS row_count,
+        SUM(au.total_pages) AS total_pages,
+        SUM(au.used_pages) AS used_pages
+    FROM sys.tables t
+    JOIN sys.schemas s ON t.schema_id = s.schema_id
+    JOIN sys.indexes i ON t.object_id = i.object_id
+    JOIN sys.partitions p ON i.object_id = p.object_id AND i.index_id = p.index_id
+    JOIN (
+        SELECT container_id, SUM(total_pages) AS total_pages, SUM(used_pages) AS used_pages
+        FROM sys.allocation_units
+        GROUP BY container_id
+    ) au ON p.partition_id = au.container_id
+    GROUP BY s.name, t.name, i.index_id, i.name
+"""
+
+# Samples are append-only. A size row is only written when it differs from the latest row of its key,
+# a row with NULL sizes marks a dropped table or index.
+STORE_DDL = """
+CREATE TABLE IF NOT EXISTS samples (sample_id INTEGER PRIMARY KEY, sampled_at TEXT NOT NULL);
+CREATE TABLE IF NOT EXISTS size_keys (
+    key_id INTEGER PRIMARY KEY,
+    schema_name TEXT NOT NULL,
+    table_name TEXT NOT NULL,
+    index_id INTEGER NOT NULL,
+    index_name TEXT NOT NULL,
+    UNIQUE (schema_name, table_name, index_id, index_name)
+);
+CREATE TABLE IF NOT EXISTS size_changes (
+    sample_id INTEGER NOT NULL,
+    key_id INTEGER NOT NULL,
+    row_count INTEGER,
+    total_pages INTEGER,
+    used_pages INTEGER,
+    PRIMARY KEY (key_id, sample_id)
+) WITHOUT ROWID;
+"""
+
+logger = logging.getLogger(__name__)
+
+KEY_COLUMNS = ['schema_name', 'table_name', 'index_id', 'index_name']
+SIZE_COLUMNS = ['row_count', 'total_pages', 'used_pages']
+PAGES_TO_MB = 8 / 1024
+
+
+def empty_history():
+    """History without any sample, typed like a non-empty one so the report works on it."""
+    return pd.DataFrame({
+        'sampled_at': pd.Series(dtype='datetime64[ns]'),
+        'table': pd.Series(dtype=object),
+        'row_count': pd.Series(dtype='int64'),
+        'total_mb': pd.Series(dtype='float64'),
+        'used_mb': pd.Series(dtype='float64'),
+    })
+
+
+class TableSizeStore:
+    """Local append-only SQLite store of table and index size samples."""
+
+    def __init__(self, path):
+        self.path = str(path)
+        with self.connect() as conn:
+            conn.executescript(STORE_DDL)
+
+    @contextmanager
+    def connect(self):
+        """Open a connection to the store, committed and closed on exit."""
+        conn = sqlite3.connect(self.path)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def latest(self, conn):
+        """Return the latest stored row of every key still present."""
+        return pd.read_sql("""
+            SELECT k.key_id, k.schema_name, k.table_name, k.index_id, k.index_name, c.row_count, c.total_pages, c.used_pages
+            FROM size_keys k
+            JOIN size_changes c ON c.key_id = k.key_id
+            WHERE c.sample_id = (SELECT MAX(sample_id) FROM size_changes WHERE key_id = k.key_id)
+              AND c.total_pages IS NOT NULL
+        """, conn)
+
+    def append_sample(self, df, sampled_at=None):
+        """Store a sample, only writing the rows that changed since the latest sample. Returns the number of rows written."""
+        sampled_at = sampled_at or datetime.now()
+        df = df[KEY_COLUMNS + SIZE_COLUMNS].astype({'index_id': int, 'row_count': int, 'total_pages': int, 'used_pages': int})
+        with self.connect() as conn:
+            sample_id = conn.execute("INSERT INTO samples (sampled_at) VALUES (?)", (sampled_at.isoformat(sep=' '),)).lastrowid
+            conn.executemany(
+                "INSERT OR IGNORE INTO size_keys (schema_name, table_name, index_id, index_name) VALUES (?, ?, ?, ?)",
+                df[KEY_COLUMNS].itertuples(index=False, name=None),
+            )
+            keys = pd.read_sql("SELECT key_id, schema_name, table_name, index_id, index_name FROM size_keys", conn)
+            latest = self.latest(conn)
+
+            merged = df.merge(keys, on=KEY_COLUMNS).merge(
+                latest[['key_id'] + SIZE_COLUMNS], on='key_id', how='left', suffixes=('', '_latest'))
+            changed = merged[(merged[SIZE_COLUMNS].values != merged[[f'{c}_latest' for c in SIZE_COLUMNS]].values).any(axis=1)]
+            dropped = latest[~latest['key_id'].isin(merged['key_id'])]
+
+            rows = [(sample_id, int(row.key_id), int(row.row_count), int(row.total_pages), int(row.used_pages))
+                    for row in changed.itertuples(index=False)]
+            rows += [(sample_id, int(key_id), None, None, None) for key_id in dropped['key_id']]
+            conn.executemany(
+                "INSERT INTO size_changes (sample_id, key_id, row_count, total_pages, used_pages) VALUES (?, ?, ?, ?, ?)",
+                rows,
+            )
+        return len(rows)
+
+    def history(self, since=None):
+        """
+        Return the size of every table at every sample taken from `since` on: sampled_at, table, row_count, total_mb
+        and used_mb. The changes of every key are turned into deltas and summed per table, so unchanged rows are
+        carried forward without expanding the samples x keys grid.
+        """
+        with self.connect() as conn:
+            samples = pd.read_sql("SELECT sample_id, sampled_at FROM samples ORDER BY sample_id", conn)
+            changes = pd.read_sql("""
+                SELECT c.sample_id, c.key_id, k.schema_name || '.' || k.table_name AS "table", k.index_id,
+                       c.row_count, c.total_pages, c.used_pages
+                FROM size_changes c
+                JOIN size_keys k ON c.key_id = k.key_id
+                ORDER BY c.key_id, c.sample_id
+            """, conn)
+        samples['sampled_at'] = pd.to_datetime(samples['sampled_at'])
+        if since is not None:
+            samples = samples[samples['sampled_at'] >= pd.Timestamp(since)]
+        if changes.empty or samples.empty:
+            return empty_history()
+
+        # Rows of the heap or clustered index are the table rows, pages are summed over every index.
+        # A dropped key counts as present = 0 with empty sizes.
+        changes['row_count'] = changes['row_count'].where(changes['index_id'] <= 1, 0)
+        changes['present'] = changes['total_pages'].notna().astype(int)
+        values = changes[SIZE_COLUMNS + ['present']].fillna(0).astype('int64')
+        deltas = values - values.groupby(changes['key_id']).shift(fill_value=0)
+        deltas['table'] = changes['table']
+        deltas['sample_id'] = changes['sample_id']
+        totals = (deltas.groupby(['table', 'sample_id'])[SIZE_COLUMNS + ['present']].sum()
+                  .groupby(level='table').cumsum().reset_index().sort_values('sample_id'))
+
+        grid = samples.merge(pd.DataFrame({'table': totals['table'].unique()}), how='cross').sort_values('sample_id')
+        history = pd.merge_asof(grid, totals, on='sample_id', by='table')
+        history = history[history['present'] > 0].astype({column: 'int64' for column in SIZE_COLUMNS})
+        history['total_mb'] = history['total_pages'] * PAGES_TO_MB
+        history['used_mb'] = history['used_pages'] * PAGES_TO_MB
+        return history.sort_values(['sampled_at', 'table'], ignore_index=True)[['sampled_at', 'table', 'row_count', 'total_mb', 'used_mb']]
+
+
+def collect(pool, store, interval_seconds=3600, samples=None, sleep=time.sleep):
+    """
+    Sample every table and index size on a schedule, `samples=None` samples until interrupted.
+    A failed sample (dropped connection, expired token) is logged and skipped. Returns the number of samples stored.
+    """
+    attempts = collected = 0
+    while samples is None or attempts < samples:
+        started = time.monotonic()
+        attempts += 1
+        try:
+            store.append_sample(pool.read_sql(TABLE_SIZES_SAMPLE_QUERY))
+            collected += 1
+        except Exception:
+            logger.exception('Table size sample failed, skipping it')
+        if samples is None or attempts < samples:
+            sleep(max(0, interval_seconds - (time.monotonic() - started)))
+    return collected
+
+
+def growth_rates(history, horizon_days=30):
+    """
+    Fit a linear trend of the size and row count of every table over its samples, with the growth per day
+    and the size projected `horizon_days` after the latest sample. Tables sampled once have no growth rate.
+    """
+    df = history.copy()
+    df['days'] = (df['sampled_at'] - df['sampled_at'].min()).dt.total_seconds() / 86400
+    for column in ['total_mb', 'row_count']:
+        df[f'days_x_{column}'] = df['days'] * df[column]
+    df['days_squared'] = df['days'] ** 2
+    sums = df.groupby('table').agg(
+        samples=('days', 'size'),
+        days_sum=('days', 'sum'),
+        days_squared_sum=('days_squared', 'sum'),
+        total_mb_sum=('total_mb', 'sum'),
+        row_count_sum=('row_count', 'sum'),
+        days_x_total_mb_sum=('days_x_total_mb', 'sum'),
+        days_x_row_count_sum=('days_x_row_count', 'sum'),
+    )
+    latest = df.sort_values('sampled_at').groupby('table').last()
+
+    # Least squares slope: (n*sum(xy) - sum(x)*sum(y)) / (n*sum(x^2) - sum(x)^2)
+    denominator = sums['samples'] * sums['days_squared_sum'] - sums['days_sum'] ** 2
+    denominator = denominator.where(denominator > 0)
+    growth = pd.DataFrame({
+        'samples': sums['samples'],
+        'total_mb': latest['total_mb'],
+        'row_count': latest['row_count'],
+        'mb_per_day': (sums['samples'] * sums['days_x_total_mb_sum'] - sums['days_sum'] * sums['total_mb_sum']) / denominator,
+        'rows_per_day': (sums['samples'] * sums['days_x_row_count_sum'] - sums['days_sum'] * sums['row_count_sum']) / denominator,
+    })
+    growth['projected_mb'] = growth['total_mb'] + growth['mb_per_day'] * horizon_days
+    growth['projected_rows'] = growth['row_count'] + growth['rows_per_day'] * horizon_days
+    return growth.sort_values('mb_per_day', ascending=False).reset_index()
+
+
+def write_top_growers(growth, path, top=20, horizon_days=30):
+    """Write the fastest growing tables with their growth rates and projected sizes."""
+    top_growers = growth.dropna(subset=['mb_per_day']).head(top)
+    with open(path, 'w') as f:
+        f.write(f'table;total_mb;mb_per_day;projected_mb_in_{horizon_days}_days;row_count;rows_per_day\n')
+        for row in top_growers.itertuples(index=False):
+            f.write(f'{row.table};{row.total_mb:.2f};{row.mb_per_day:.2f};{row.projected_mb:.2f};'
+                    f'{int(row.row_count)};{row.rows_per_day:.0f}\n')
+
+
+def render_trends(history, growth, path, top=10):
+    """Render the size trend of the fastest growing tables to a PNG, without a display."""
+    tables = list(growth.dropna(subset=['mb_per_day'])['table'].head(top))
+    fig = Figure(figsize=(12, 8))
+    ax = fig.subplots()
+    for table in tables:
+        table_history = history[history['table'] == table].sort_values('sampled_at')
+        ax.plot(table_history['sampled_at'], table_history['total_mb'], marker='o', label=table)
+    ax.set_xlabel('Sampled at')
+    ax.set_ylabel('Total space (MB)')
+    ax.set_title(f'Top {len(tables)} Growing Tables')
+    if tables:
+        ax.legend()
+    fig.autofmt_xdate()
+    fig.savefig(path)
+
+
+def report(store, output_dir='.', top=20, horizon_days=30, since=None):
+    """
+    Render the trend chart and the top growers report from the local store, without querying the server.
+    `since` limits the report to the samples taken from that date on.
+    """
+    history = store.history(since)
+    growth = growth_rates(history, horizon_days)
+    write_top_growers(growth, os.path.join(output_dir, 'Output_4-top_growing_tables.txt'), top, horizon_days)
+    render_trends(history, growth, os.path.join(output_dir, 'Output_4-table_size_trends.png'), min(top, 10))
+    return growth
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Collect table sizes over time and report the fastest growing tables.')
+    parser.add_argument('mode', choices=['collect', 'report'])
+    parser.add_argument('--store', default='table_sizes.db', help='Local SQLite store of the samples')
+    parser.add_argument('--interval', type=int, default=3600, help='Seconds between two samples')
+    parser.add_argument('--samples', type=int, default=None, help='Number of samples to collect, until interrupted by default')
+    parser.add_argument('--output-dir', default='.')
+    parser.add_argument('--top', type=int, default=20)
+    parser.add_argument('--horizon-days', type=int, default=30)
+    parser.add_argument('--since', type=datetime.fromisoformat, default=None, help='Only report the samples taken from this date on')
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO)
+
+    table_size_store = TableSizeStore(args.store)
+    if args.mode == 'collect':
+        from db_pool import create_azure_pool
+        with create_azure_pool(pool_size=1, max_workers=1) as pool:
+            collect(pool, table_size_store, args.interval, args.samples)
+    else:
+        report(table_size_store, args.output_dir, args.top, args.horizon_days, args.since)
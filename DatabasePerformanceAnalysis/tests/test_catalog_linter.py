@@ -0,0 +1,72 @@
+import os
+import tempfile
+import unittest
+import pandas as pd
+from catalog_linter import CatalogLinter, lint_names, summarize
+from sqlite_standin import create_sqlite_pool, insert_rows, seed_sample_catalog
+
+
+class TestCatalogLinter(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.pool = create_sqlite_pool(os.path.join(self.tmp_dir.name, 'catalog.db'))
+        seed_sample_catalog(self.pool)
+        self.linter = CatalogLinter(os.path.join(self.tmp_dir.name, 'catalog_lint.db'))
+
+    def tearDown(self):
+        self.pool.dispose()
+        self.tmp_dir.cleanup()
+
+    def execute(self, statement):
+        with self.pool.engine.begin() as conn:
+            conn.exec_driver_sql(statement)
+
+    def test_lint_names(self):
+        """Test the Snake_Pascal_Case check."""
+        df = pd.DataFrame({'object_name': ['Staff_Group', 'Ui2_Tile', 'staff_group', 'PK_Staff', 'Staff_', None]})
+        self.assertEqual(list(lint_names(df)['is_standard']), [True, True, False, False, False, False])
+
+    def test_full_run(self):
+        """Test that every object type is collected by the catalog query and summarized per type and schema."""
+        linted = self.linter.run(self.pool)
+        summary = summarize(self.linter.violations(linted))
+        self.assertEqual(dict(zip(summary['object_type'], summary['violations'])), {
+            'COLUMN': 1, 'DEFAULT_CONSTRAINT': 1, 'INDEX': 1, 'PRIMARY_KEY_CONSTRAINT': 1, 'SQL_STORED_PROCEDURE': 1, 'USER_TABLE': 5,
+        })
+        # System named constraints and the index of the table type are not linted
+        self.assertNotIn('DF__Task_Wor__Creat__1A2B3C4D', list(linted['object_name']))
+        self.assertNotIn('IX_TT_Task_Ids_5A1B2C3D', list(linted['object_name']))
+        self.assertEqual(list(linted.loc[linted['object_type'] == 'PRIMARY_KEY_CONSTRAINT', 'object_name']), ['PK_customers'])
+        self.assertIn('Staff_Overview', list(linted.loc[linted['object_type'] == 'VIEW', 'object_name']))
+
+    def test_incremental_run(self):
+        """Test that a re-run only pulls the owners modified since the last run."""
+        self.linter.run(self.pool)
+        query, params = self.linter.catalog_query()
+        self.assertEqual(len(self.pool.read_sql(query, params=params)), 0)
+
+        # Rename a table and add a column to it
+        self.execute("UPDATE sys.objects SET name = 'Customers', modify_date = '2024-02-01 00:00:00' WHERE object_id = 3")
+        insert_rows(self.pool, 'sys.columns', [{'object_id': 3, 'column_id': 3, 'name': 'Customer_Code'}])
+        query, params = self.linter.catalog_query()
+        pulled = self.pool.read_sql(query, params=params)
+        self.assertEqual(set(pulled['owner_object_id']), {3})
+
+        linted = self.linter.apply(pulled)
+        violations = self.linter.violations()
+        self.assertNotIn('customers', list(violations['object_name']))
+        self.assertIn('Customer_Code', list(linted['object_name']))
+        self.assertEqual(len(violations[violations['object_type'] == 'USER_TABLE']), 4)
+        self.assertEqual(self.linter.watermark(), pd.Timestamp('2024-02-01').to_pydatetime())
+
+    def test_full_run_removes_dropped_objects(self):
+        """Test that a full run forgets the dropped objects."""
+        self.linter.run(self.pool)
+        self.execute("DELETE FROM sys.objects WHERE object_id = 202")
+        self.assertIn('usp_get_tasks', list(self.linter.run(self.pool)['object_name']))
+        self.assertNotIn('usp_get_tasks', list(self.linter.run(self.pool, full=True)['object_name']))
+
+
+if __name__ == '__main__':
+    unittest.main()
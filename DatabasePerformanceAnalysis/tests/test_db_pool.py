@@ -0,0 +1,83 @@
+import os
+import tempfile
+import threading
+import time
+import unittest
+from collections import namedtuple
+from db_pool import AccessTokenCache
+from sqlite_standin import create_sqlite_pool, seed_sample_catalog, translate_tsql
+
+AccessToken = namedtuple('AccessToken', ['token', 'expires_on'])
+
+
+class FakeCredential:
+    def __init__(self, lifetime_seconds):
+        self.lifetime_seconds = lifetime_seconds
+        self.calls = 0
+
+    def get_token(self, scope):
+        self.calls += 1
+        return AccessToken(f'token-{self.calls}', time.time() + self.lifetime_seconds)
+
+
+class TestAccessTokenCache(unittest.TestCase):
+
+    def test_token_is_cached_until_expiry(self):
+        """Test that the credential is only asked again once the token is about to expire."""
+        credential = FakeCredential(lifetime_seconds=3600)
+        cache = AccessTokenCache(credential, refresh_margin_seconds=300)
+        self.assertEqual(cache.get_token(), 'token-1')
+        self.assertEqual(cache.get_token(), 'token-1')
+        self.assertEqual(credential.calls, 1)
+
+        credential.lifetime_seconds = 60  # Expires within the refresh margin
+        cache._access_token = credential.get_token(cache.scope)
+        self.assertEqual(cache.get_token(), 'token-3')
+
+    def test_token_struct(self):
+        """Test that the token is packed as a length-prefixed UTF-16-LE string."""
+        cache = AccessTokenCache(FakeCredential(lifetime_seconds=3600))
+        token_struct = cache.token_struct()
+        self.assertEqual(int.from_bytes(token_struct[:4], 'little'), len('token-1'.encode('UTF-16-LE')))
+        self.assertEqual(token_struct[4:].decode('UTF-16-LE'), 'token-1')
+
+
+class TestSqliteStandin(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.pool = create_sqlite_pool(os.path.join(self.tmp_dir.name, 'catalog.db'))
+        seed_sample_catalog(self.pool)
+
+    def tearDown(self):
+        self.pool.dispose()
+        self.tmp_dir.cleanup()
+
+    def test_translate_tsql(self):
+        """Test that SELECT TOP n is rewritten to a LIMIT clause."""
+        self.assertEqual(translate_tsql("SELECT TOP 15 name FROM sys.tables ORDER BY name;"),
+                         "SELECT name FROM sys.tables ORDER BY name LIMIT 15")
+        self.assertEqual(translate_tsql("SELECT name FROM sys.tables"), "SELECT name FROM sys.tables")
+
+    def test_read_many_runs_concurrently(self):
+        """Test that independent queries run on several threads and each gets its own result."""
+        threads = set()
+        read_sql = self.pool.read_sql
+
+        def read_sql_on_thread(query, **kwargs):
+            threads.add(threading.get_ident())
+            time.sleep(0.05)
+            return read_sql(query, **kwargs)
+
+        self.pool.read_sql = read_sql_on_thread
+        results = self.pool.read_many({
+            'tables': "SELECT TOP 3 name FROM sys.tables ORDER BY name",
+            'names': "SELECT CONCAT(s.name, '.', t.name) AS name FROM sys.tables t JOIN sys.schemas s ON t.schema_id = s.schema_id",
+        })
+        self.assertGreater(len(threads), 1)
+        self.assertEqual(len(results['tables']), 3)
+        self.assertIn('dbo.Staff_Group', list(results['names']['name']))
+
+
+if __name__ == '__main__':
+    unittest.main()
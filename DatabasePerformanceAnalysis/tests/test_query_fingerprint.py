@@ -0,0 +1,63 @@
+import unittest
+import pandas as pd
+from query_fingerprint import FingerprintAggregator, fingerprint_hash, fingerprint_sql
+
+
+class TestFingerprint(unittest.TestCase):
+
+    def test_fingerprint_sql(self):
+        """Test that literals, parameters, comments, whitespace and case are normalized."""
+        self.assertEqual(
+            fingerprint_sql("SELECT *  FROM Staff -- comment\nWHERE id = 42 AND name = N'O''Brien' /* other */ AND flag = 0x1F"),
+            "select * from staff where id = ? and name = ? and flag = ?",
+        )
+        self.assertEqual(fingerprint_sql("(@1 int,@2 varchar(8000))UPDATE t SET a = @2 WHERE id = @1"),
+                         "update t set a = ? where id = ?")
+        self.assertEqual(fingerprint_sql("SELECT a FROM t WHERE id IN (1, 2, 3)"), "select a from t where id in (?)")
+        self.assertEqual(fingerprint_sql("SELECT Table1.a FROM Table1"), "select table1.a from table1")
+
+    def test_comment_markers_inside_literals(self):
+        """Test that comment markers inside string literals do not hide the rest of the query."""
+        self.assertEqual(fingerprint_sql("SELECT a FROM t WHERE c = '--' AND d = 1"), "select a from t where c = ? and d = ?")
+        self.assertNotEqual(fingerprint_sql("SELECT a FROM t WHERE c = '--' AND d = 1"),
+                            fingerprint_sql("SELECT a FROM t WHERE c = '--' AND e = 2"))
+        self.assertEqual(fingerprint_sql("SELECT a FROM t WHERE c = 'it''s -- ok' AND d = '/* x */'"),
+                         "select a from t where c = ? and d = ?")
+        self.assertEqual(fingerprint_sql("SELECT a FROM t -- it's a comment\nWHERE c = 'x'"), "select a from t where c = ?")
+
+    def test_fingerprint_hash(self):
+        """Test that queries differing only in literals and whitespace share the same hash."""
+        self.assertEqual(fingerprint_hash("SELECT * FROM t WHERE id = 1"), fingerprint_hash("select *\n  from t where id = 2"))
+        self.assertNotEqual(fingerprint_hash("SELECT * FROM t WHERE id = 1"), fingerprint_hash("SELECT * FROM u WHERE id = 1"))
+
+
+class TestFingerprintAggregator(unittest.TestCase):
+
+    def test_streaming_aggregation(self):
+        """Test that chunks of several lists are aggregated by fingerprint."""
+        aggregator = FingerprintAggregator()
+        aggregator.add('long_running', iter([
+            pd.DataFrame({'query_sql_text': ["SELECT * FROM t WHERE id = 1", "DELETE FROM u"]}),
+            pd.DataFrame({'query_sql_text': ["SELECT * FROM t WHERE id = 2"]}),
+        ]))
+        aggregator.add('most_executed', pd.DataFrame({'query_sql_text': ["select * from t where id = 3", "UPDATE v SET a = 1"]}))
+
+        results = aggregator.results(min_lists=2)
+        self.assertEqual(len(results), 1)
+        key, occurrences, lists, sample = results[0]
+        self.assertEqual(key, fingerprint_hash("SELECT * FROM t WHERE id = 1"))
+        self.assertEqual(occurrences, 3)
+        self.assertEqual(lists, ['long_running', 'most_executed'])
+        self.assertEqual(sample, "SELECT * FROM t WHERE id = 1")
+        self.assertEqual(len(aggregator.results()), 3)
+
+    def test_aggregation_on_query_hash(self):
+        """Test that rows are keyed on the server query hash when a key column is given."""
+        aggregator = FingerprintAggregator(key_column='query_hash')
+        aggregator.add('long_running', pd.DataFrame({'query_hash': [b'\x01', b'\x02'], 'query_sql_text': ["a", "b"]}))
+        aggregator.add('multiple_plans', pd.DataFrame({'query_hash': [b'\x01'], 'query_sql_text': ["a"]}))
+        self.assertEqual([row[0] for row in aggregator.results(min_lists=2)], ['01'])
+
+
+if __name__ == '__main__':
+    unittest.main()
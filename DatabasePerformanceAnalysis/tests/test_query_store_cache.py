@@ -0,0 +1,97 @@
+import os
+import sqlite3
+import tempfile
+import unittest
+from query_store_cache import QueryStoreCache
+from sqlite_standin import create_sqlite_pool, insert_rows, seed_sample_catalog
+
+
+class TestQueryStoreCache(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.pool = create_sqlite_pool(os.path.join(self.tmp_dir.name, 'catalog.db'))
+        seed_sample_catalog(self.pool)
+        self.cache = QueryStoreCache(os.path.join(self.tmp_dir.name, 'query_store_cache.db'))
+
+    def tearDown(self):
+        self.pool.dispose()
+        self.tmp_dir.cleanup()
+
+    def test_refresh_pulls_only_new_rows(self):
+        """Test that a repeat refresh only pulls the latest interval and the rows above the watermarks."""
+        first = self.cache.refresh(self.pool)
+        self.assertEqual(first, {
+            'query_store_query_text': 5,
+            'query_store_query': 5,
+            'query_store_plan': 20,
+            'query_store_runtime_stats': 20,
+        })
+
+        # Nothing new: only the runtime stats of the still open interval are pulled again
+        second = self.cache.refresh(self.pool)
+        self.assertEqual(second, {
+            'query_store_query_text': 0,
+            'query_store_query': 0,
+            'query_store_plan': 0,
+            'query_store_runtime_stats': 20,
+        })
+
+        insert_rows(self.pool, 'sys.query_store_plan', [{'plan_id': 21, 'query_id': 1}])
+        insert_rows(self.pool, 'sys.query_store_runtime_stats', [{
+            'runtime_stats_id': 21, 'plan_id': 21, 'runtime_stats_interval_id': 2, 'count_executions': 1000,
+            'avg_duration': 10.0, 'max_duration': 20.0, 'min_duration': 5.0,
+        }])
+        third = self.cache.refresh(self.pool)
+        self.assertEqual(third['query_store_plan'], 1)
+        self.assertEqual(third['query_store_runtime_stats'], 21)
+        self.assertEqual(self.cache.watermarks()['query_store_runtime_stats'], 2)
+        # Interval 1 is closed now, only interval 2 is pulled again
+        self.assertEqual(self.cache.refresh(self.pool)['query_store_runtime_stats'], 1)
+
+        # The local analyses see the new plan: query 1 is now the most executed one
+        most_executed = self.cache.top_most_executed()
+        self.assertEqual(most_executed['query_id'].iloc[0], 1)
+        self.assertEqual(most_executed['total_executions'].iloc[0], 1020)
+
+    def test_refresh_drops_intervals_removed_from_the_server(self):
+        """Test that the intervals dropped by the server retention are dropped with their orphaned plans, queries and texts."""
+        self.cache.refresh(self.pool)
+        # Only plan 14 of query 4 and the plans 15 to 20 of query 5 run in interval 2, then the server drops interval 1
+        insert_rows(self.pool, 'sys.query_store_runtime_stats', [{
+            'runtime_stats_id': 100 + plan_id, 'plan_id': plan_id, 'runtime_stats_interval_id': 2, 'count_executions': 1,
+            'avg_duration': 10.0, 'max_duration': 20.0, 'min_duration': 5.0,
+        } for plan_id in range(14, 21)])
+        connection = self.pool.engine.raw_connection()
+        try:
+            connection.cursor().execute("DELETE FROM sys.query_store_runtime_stats WHERE runtime_stats_interval_id = 1")
+            connection.commit()
+        finally:
+            connection.close()
+
+        self.cache.refresh(self.pool)
+        with sqlite3.connect(self.cache.path) as conn:
+            self.assertEqual(conn.execute("SELECT DISTINCT runtime_stats_interval_id FROM query_store_runtime_stats").fetchall(), [(2,)])
+            self.assertEqual([row[0] for row in conn.execute("SELECT plan_id FROM query_store_plan ORDER BY plan_id")], list(range(14, 21)))
+            self.assertEqual([row[0] for row in conn.execute("SELECT query_id FROM query_store_query ORDER BY query_id")], [4, 5])
+            self.assertEqual([row[0] for row in conn.execute("SELECT query_text_id FROM query_store_query_text ORDER BY query_text_id")], [4, 5])
+        conn.close()
+        self.assertEqual(list(self.cache.top_most_executed()['total_executions']), [6, 1])
+
+    def test_top_analyses(self):
+        """Test the top-N analyses against the snapshot."""
+        self.cache.refresh(self.pool)
+        self.assertEqual(len(self.cache.top_long_running()), 15)
+        self.assertEqual(list(self.cache.top_multiple_plans()['query_id']), [5, 4, 3])
+        self.assertEqual(list(self.cache.top_multiple_plans()['query_hash']), [(5).to_bytes(8, 'big'), (4).to_bytes(8, 'big'), (3).to_bytes(8, 'big')])
+        self.assertEqual(list(self.cache.top_most_executed(top=2)['query_id']), [5, 4])
+
+    def test_streamed_top_analyses(self):
+        """Test that every row of a top-N analysis can be streamed in chunks."""
+        self.cache.refresh(self.pool)
+        chunks = list(self.cache.top_long_running(top=None, chunksize=6))
+        self.assertEqual([len(chunk) for chunk in chunks], [6, 6, 6, 2])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,77 @@
+import importlib.util
+import os
+import tempfile
+import unittest
+from sqlite_standin import create_sqlite_pool, insert_rows, seed_sample_catalog
+
+SCRIPT_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'Solution-Problem2.py')
+
+
+def load_solution():
+    """Load Solution-Problem2.py, its file name is not a valid module name."""
+    spec = importlib.util.spec_from_file_location('solution_problem2', SCRIPT_PATH)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+class TestSolutionProblem2(unittest.TestCase):
+
+    def setUp(self):
+        self.solution = load_solution()
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.pool = create_sqlite_pool(os.path.join(self.tmp_dir.name, 'catalog.db'))
+        seed_sample_catalog(self.pool)
+
+    def tearDown(self):
+        self.pool.dispose()
+        self.tmp_dir.cleanup()
+
+    def run_analysis(self):
+        self.solution.run_analysis(self.pool, self.tmp_dir.name, os.path.join(self.tmp_dir.name, 'query_store_cache.db'),
+                                   os.path.join(self.tmp_dir.name, 'catalog_lint.db'))
+
+    def read_output(self, file_name):
+        with open(os.path.join(self.tmp_dir.name, file_name)) as f:
+            return f.read().splitlines()
+
+    def test_run_analysis(self):
+        """Test the whole pipeline offline against the SQLite stand-in."""
+        self.run_analysis()
+
+        self.assertTrue(os.path.exists(os.path.join(self.tmp_dir.name, 'Output_1-viz_table_sizes.png')))
+        self.assertEqual(sorted(self.read_output('Output_2-non_standard_tables.txt')),
+                         ['PS_Answers', 'UI_Tile', 'Ui_Tile_bak', 'customers', 'date_table'])
+        self.assertEqual(self.read_output('Output_2-non_standard_objects.txt'), [
+            '[COLUMN] dbo (1)', 'customers.customer_name', '',
+            '[DEFAULT_CONSTRAINT] dbo (1)', 'Staff_Group.DF_Staff_Group_Active', '',
+            '[INDEX] dbo (1)', 'customers.ix_customers_name', '',
+            '[PRIMARY_KEY_CONSTRAINT] dbo (1)', 'customers.PK_customers', '',
+            '[SQL_STORED_PROCEDURE] dbo (1)', 'usp_get_tasks', '',
+            '[USER_TABLE] dbo (5)', 'PS_Answers', 'UI_Tile', 'Ui_Tile_bak', 'customers', 'date_table', '',
+        ])
+        # Queries 3 to 5 have more than 3 plans, the long running list has one row per plan
+        self.assertEqual(self.read_output('Output_3-query_counts.txt'), [
+            '8;DELETE FROM UI_Tile WHERE UI_Tile_Id = @1',
+            '7;SELECT COUNT(*) FROM date_table',
+            '6;UPDATE customers SET name = @1 WHERE id = @2',
+        ])
+
+    def test_run_analysis_follows_query_store_retention(self):
+        """Test that a re-run drops the intervals the server no longer keeps from the snapshot and the outputs."""
+        self.run_analysis()
+
+        # Only the plans 15 to 20 of query 5 run in interval 2, then the server drops interval 1
+        insert_rows(self.pool, 'sys.query_store_runtime_stats', [{
+            'runtime_stats_id': 100 + plan_id, 'plan_id': plan_id, 'runtime_stats_interval_id': 2, 'count_executions': 1,
+            'avg_duration': 10.0, 'max_duration': 20.0, 'min_duration': 5.0,
+        } for plan_id in range(15, 21)])
+        with self.pool.engine.begin() as conn:
+            conn.exec_driver_sql("DELETE FROM sys.query_store_runtime_stats WHERE runtime_stats_interval_id = 1")
+        self.run_analysis()
+
+        self.assertEqual(self.read_output('Output_3-query_counts.txt'), ['8;DELETE FROM UI_Tile WHERE UI_Tile_Id = @1'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,128 @@
+import os
+import tempfile
+import unittest
+from datetime import datetime, timedelta
+from sqlite_standin import create_sqlite_pool, seed_sample_catalog
+from table_size_collector import TABLE_SIZES_SAMPLE_QUERY, TableSizeStore, collect, growth_rates, report
+
+
+class TestTableSizeCollector(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.pool = create_sqlite_pool(os.path.join(self.tmp_dir.name, 'catalog.db'))
+        seed_sample_catalog(self.pool)
+        self.store = TableSizeStore(os.path.join(self.tmp_dir.name, 'table_sizes.db'))
+        self.started = datetime(2024, 1, 1)
+
+    def tearDown(self):
+        self.pool.dispose()
+        self.tmp_dir.cleanup()
+
+    def execute(self, statement):
+        with self.pool.engine.begin() as conn:
+            conn.exec_driver_sql(statement)
+
+    def sample(self, days):
+        return self.store.append_sample(self.pool.read_sql(TABLE_SIZES_SAMPLE_QUERY), self.started + timedelta(days=days))
+
+    def grow_staff_group(self, pages, rows):
+        self.execute(f"UPDATE sys.allocation_units SET total_pages = total_pages + {pages}, used_pages = used_pages + {pages} WHERE container_id = 1")
+        self.execute(f"UPDATE sys.partitions SET rows = rows + {rows} WHERE partition_id = 1")
+
+    def test_only_changed_rows_are_written(self):
+        """Test that a sample only writes the new, changed and dropped rows."""
+        self.assertEqual(self.sample(0), 8)
+        self.assertEqual(self.sample(1), 0)
+        self.grow_staff_group(pages=128, rows=500)
+        self.assertEqual(self.sample(2), 1)
+        self.execute("DELETE FROM sys.tables WHERE object_id = 8")
+        self.assertEqual(self.sample(3), 1)
+
+        history = self.store.history()
+        self.assertEqual(len(history[history['sampled_at'] == self.started + timedelta(days=3)]), 7)
+        staff_group = history[history['table'] == 'dbo.Staff_Group'].sort_values('sampled_at')
+        self.assertEqual(list(staff_group['row_count']), [1000, 1000, 1500, 1500])
+        self.assertEqual(list(staff_group['total_mb']), [10, 10, 11, 11])
+
+    def test_history_since_carries_values_forward(self):
+        """Test that a windowed history carries forward the changes taken before the window, and that a re-created table comes back."""
+        self.sample(0)
+        self.grow_staff_group(pages=128, rows=500)
+        self.sample(1)
+        self.execute("DELETE FROM sys.tables WHERE object_id = 8")
+        self.sample(2)
+        self.execute("INSERT INTO sys.tables (object_id, name, schema_id) VALUES (8, 'PS_Answers', 1)")
+        self.sample(3)
+        self.sample(4)
+
+        history = self.store.history(since=self.started + timedelta(days=2))
+        self.assertEqual(sorted(history['sampled_at'].unique()), [self.started + timedelta(days=day) for day in (2, 3, 4)])
+        staff_group = history[history['table'] == 'dbo.Staff_Group']
+        self.assertEqual(list(staff_group['row_count']), [1500, 1500, 1500])
+        self.assertEqual(list(staff_group['total_mb']), [11, 11, 11])
+        ps_answers = history[history['table'] == 'dbo.PS_Answers']
+        self.assertEqual(list(ps_answers['sampled_at']), [self.started + timedelta(days=day) for day in (3, 4)])
+        self.assertEqual(list(ps_answers['row_count']), [8000, 8000])
+
+    def test_growth_rates_and_report(self):
+        """Test the growth rates, projections and the headless report."""
+        for day in range(4):
+            self.sample(day)
+            self.grow_staff_group(pages=256, rows=100)
+
+        growth = growth_rates(self.store.history(), horizon_days=10).set_index('table')
+        self.assertAlmostEqual(growth.loc['dbo.Staff_Group', 'mb_per_day'], 2)
+        self.assertAlmostEqual(growth.loc['dbo.Staff_Group', 'rows_per_day'], 100)
+        self.assertAlmostEqual(growth.loc['dbo.Staff_Group', 'projected_mb'], 16 + 20)
+        self.assertAlmostEqual(growth.loc['dbo.customers', 'mb_per_day'], 0)
+
+        report(self.store, self.tmp_dir.name, top=3, horizon_days=10)
+        self.assertTrue(os.path.exists(os.path.join(self.tmp_dir.name, 'Output_4-table_size_trends.png')))
+        with open(os.path.join(self.tmp_dir.name, 'Output_4-top_growing_tables.txt')) as f:
+            lines = f.read().splitlines()
+        self.assertEqual(len(lines), 4)
+        self.assertEqual(lines[1], 'dbo.Staff_Group;16.00;2.00;36.00;1300;100')
+
+    def test_report_on_empty_history(self):
+        """Test that an empty store, or a window after the last sample, writes an empty report and chart."""
+        output_files = ['Output_4-top_growing_tables.txt', 'Output_4-table_size_trends.png']
+        self.assertTrue(report(self.store, self.tmp_dir.name).empty)
+        for file_name in output_files:
+            self.assertTrue(os.path.exists(os.path.join(self.tmp_dir.name, file_name)))
+            os.remove(os.path.join(self.tmp_dir.name, file_name))
+
+        self.sample(0)
+        self.assertTrue(report(self.store, self.tmp_dir.name, since=self.started + timedelta(days=1)).empty)
+        with open(os.path.join(self.tmp_dir.name, output_files[0])) as f:
+            self.assertEqual(len(f.read().splitlines()), 1)
+        self.assertTrue(os.path.exists(os.path.join(self.tmp_dir.name, output_files[1])))
+
+    def test_collect(self):
+        """Test that the collector samples on a schedule."""
+        sleeps = []
+        self.assertEqual(collect(self.pool, self.store, interval_seconds=60, samples=3, sleep=sleeps.append), 3)
+        self.assertEqual(len(sleeps), 2)
+        self.assertEqual(self.store.history()['sampled_at'].nunique(), 3)
+
+    def test_collect_skips_failed_samples(self):
+        """Test that a failed sample is logged and skipped without stopping the collector."""
+        read_sql = self.pool.read_sql
+        results = iter([ConnectionError('connection dropped'), None, None])
+
+        def flaky_read_sql(query, **kwargs):
+            error = next(results)
+            if error is not None:
+                raise error
+            return read_sql(query, **kwargs)
+
+        self.pool.read_sql = flaky_read_sql
+        sleeps = []
+        with self.assertLogs('table_size_collector', level='ERROR'):
+            self.assertEqual(collect(self.pool, self.store, interval_seconds=60, samples=3, sleep=sleeps.append), 2)
+        self.assertEqual(len(sleeps), 2)
+        self.assertEqual(self.store.history()['sampled_at'].nunique(), 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
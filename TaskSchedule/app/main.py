@@ -1,11 +1,44 @@
-from fastapi import FastAPI, HTTPException, Depends
+import time
+IMPORT_STARTED = time.perf_counter()
+
+from contextlib import asynccontextmanager
+import os
+from typing import List, Optional
+from fastapi import FastAPI, HTTPException, Depends, Query
+from fastapi.responses import JSONResponse
 from app.model.model import ConfigFaker
-from app.utils.helpers import get_config_data
+from app.utils.compression import CompressionMiddleware
+from app.utils.helpers import get_config_data, parse_fields, encode_cursor, decode_cursor
 from app.utils.logger import logger
+from app.utils.metrics import LatencyMiddleware, latency_report
 from app.services.data_generator import DataGenerator
 from app.services.task_scheduler import TaskScheduler
+from app.services.schedule_cache import CachedSchedule, schedule_cache, SCHEDULE_FIELDS, DEFAULT_FIELDS
+from app.services.warmup import warm_up
+
+MAX_PAGE_SIZE = 10000
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Warm up the application before it accepts requests, unless WARMUP_ON_STARTUP is set to 0."""
+    if os.getenv("WARMUP_ON_STARTUP", "1") != "0":
+        latency_report.warmup_ms = warm_up()
+    yield
+
+app = FastAPI(lifespan=lifespan)
+app.add_middleware(CompressionMiddleware, minimum_size=1000)
+app.add_middleware(LatencyMiddleware)
 
-app = FastAPI()
+def schedule_page(schedule: CachedSchedule, selected_fields: List[str], cursor: Optional[str], limit: Optional[int]) -> JSONResponse:
+    """Build the projected and paginated response of a cached schedule."""
+    offset = decode_cursor(cursor, schedule.scheduleId) if cursor else 0
+    if cursor and limit is None:
+        raise HTTPException(status_code=400, detail="limit is required when a cursor is given")
+    response = schedule.project(selected_fields, offset, limit)
+    if limit is not None:
+        next_offset = response.pop("nextOffset")
+        response["nextCursor"] = encode_cursor(schedule.scheduleId, next_offset) if next_offset is not None else None
+    return JSONResponse(content=response)
 
 @app.post("/generate")
 async def generate_data(config: ConfigFaker = Depends(get_config_data)):
@@ -17,11 +50,17 @@ async def generate_data(config: ConfigFaker = Depends(get_config_data)):
         return {"locations": locations, "newTasks": newTasks}
     except Exception as e:
         logger.error(f"Error generating data: {e}")
-        raise HTTPException(status_code=500, detail="Internal Server Error - Error generating data")  
-    
+        raise HTTPException(status_code=500, detail="Internal Server Error - Error generating data")
+
 @app.post("/schedule")
-async def schedule_tasks(config: ConfigFaker = Depends(get_config_data)):
-    """Endpoint for scheduling tasks based on the provided configuration."""
+async def schedule_tasks(config: ConfigFaker = Depends(get_config_data),
+                         fields: Optional[str] = Query(None, description="Comma-separated fields to return, e.g. currentTasks,summary"),
+                         limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE, description="Page size of the task lists")):
+    """
+    Endpoint for scheduling tasks based on the provided configuration.
+    The result is cached server-side, later pages are read from `GET /schedule/{scheduleId}`.
+    """
+    selected_fields = parse_fields(fields, SCHEDULE_FIELDS, DEFAULT_FIELDS)  # Rejected before any scheduling work
     try:
         data_generator = DataGenerator(config)
         locations = data_generator.generate_locations()
@@ -29,7 +68,27 @@ async def schedule_tasks(config: ConfigFaker = Depends(get_config_data)):
         staffs = data_generator.generate_staffs(locations)
         scheduler = TaskScheduler(config, locations, newTasks, staffs)
         scheduler.assign_tasks_to_staff()
-        return {"newTasks": scheduler.newTasks, "locations": scheduler.locations, "currentTasks": scheduler.currentTasks, "staffs": scheduler.staffs}
+        schedule = schedule_cache.put(CachedSchedule(scheduler.locations, scheduler.newTasks, scheduler.currentTasks, scheduler.staffs))
     except Exception as e:
         logger.error(f"Error scheduling tasks: {e}")
-        raise HTTPException(status_code=500, detail="Internal Server Error - Error scheduling tasks")
\ No newline at end of file
+        raise HTTPException(status_code=500, detail="Internal Server Error - Error scheduling tasks")
+    return schedule_page(schedule, selected_fields, None, limit)
+
+@app.get("/schedule/{schedule_id}")
+async def get_schedule(schedule_id: str,
+                       fields: Optional[str] = Query(None, description="Comma-separated fields to return, e.g. currentTasks,summary"),
+                       cursor: Optional[str] = Query(None, description="Cursor of the page to return, taken from nextCursor"),
+                       limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE, description="Page size of the task lists")):
+    """Endpoint for reading a cached scheduling result without recomputing it."""
+    selected_fields = parse_fields(fields, SCHEDULE_FIELDS, DEFAULT_FIELDS)
+    schedule = schedule_cache.get(schedule_id)
+    if schedule is None:
+        raise HTTPException(status_code=404, detail="Schedule not found or expired")
+    return schedule_page(schedule, selected_fields, cursor, limit)
+
+@app.get("/metrics/startup")
+async def startup_metrics():
+    """Endpoint reporting the import time, the warm-up time and the first-request and p99 latencies per route."""
+    return latency_report.report()
+
+latency_report.import_ms = (time.perf_counter() - IMPORT_STARTED) * 1000
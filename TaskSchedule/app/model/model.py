@@ -1,9 +1,13 @@
-from pydantic import BaseModel, field_validator, model_validator
+from pydantic import BaseModel, ConfigDict, field_validator, model_validator
 from typing import List, Optional
 from datetime import datetime
 
 
-class LocationConfig(BaseModel):
+class LazyModel(BaseModel):
+    """Base model whose validators and serializers are built on first use or by the startup warm-up."""
+    model_config = ConfigDict(defer_build=True)
+
+class LocationConfig(LazyModel):
     random_range: List[int]
     
     @field_validator('random_range')
@@ -12,7 +16,7 @@ class LocationConfig(BaseModel):
             raise ValueError("random_range must have exactly two elements, and the first must be less than or equal to the second.")
         return v
     
-class NewTaskConfig(BaseModel):
+class NewTaskConfig(LazyModel):
     random_range: List[int]
     slot_start_range: List[int]
     slot_duration: int
@@ -38,7 +42,7 @@ class NewTaskConfig(BaseModel):
             raise ValueError("slot_duration must be a positive integer within a practical range (1-1440 minutes).")
         return v
 
-class StaffConfig(BaseModel):
+class StaffConfig(LazyModel):
     random_range: List[int]
     shift_choice: List[List[int]]
     transition_velocity: int
@@ -62,7 +66,7 @@ class StaffConfig(BaseModel):
             raise ValueError("transition_velocity must be a positive integer.")
         return v
     
-class CurrentTaskConfig(BaseModel):
+class CurrentTaskConfig(LazyModel):
     assign_max_num_tasks: int
     
     @field_validator('assign_max_num_tasks')
@@ -71,7 +75,7 @@ class CurrentTaskConfig(BaseModel):
             raise ValueError("assign_max_num_tasks must be -1 or a non-negative integer.")
         return v
 
-class ConfigFaker(BaseModel):
+class ConfigFaker(LazyModel):
     start_end_date: List[str]
     location: LocationConfig
     new_task: NewTaskConfig
@@ -102,20 +106,20 @@ class ConfigFaker(BaseModel):
                 raise ValueError("The date range should not exceed 3 months.")
         return values
     
-class Location(BaseModel):
+class Location(LazyModel):
     """Represents a location with an ID and coordinates."""
     locationId: str
     latitude: float
     longitude: float
 
-class Slot(BaseModel):
+class Slot(LazyModel):
     """Represents a time slot for tasks or staff availability."""
     startDate: str
     endDate: str
     slotStart: int
     slotEnd: int
 
-class Task(BaseModel):
+class Task(LazyModel):
     """Represents a task with its location, time slot, and assignment status."""
     locationId: str
     slot: Slot
@@ -123,15 +127,22 @@ class Task(BaseModel):
     taskAssignmentStatus: str
     assignedStaffId: Optional[str] = None
 
-class Staff(BaseModel):
+class Staff(LazyModel):
     """Represents a staff member with their ID, location, and available slots."""
     staffId: str
     locationId: str
     availableDateShiftSlots: List[Slot]
 
-class StaffState(BaseModel):
+class StaffState(LazyModel):
     """Represents current state of a staff member with their ID, location, available slots, current tasks."""
     staffId: str
     locationId: str
     availableSlot: Optional[Slot] = None
-    currentTasks: Optional[List[Task]] = None
\ No newline at end of file
+    currentTasks: Optional[List[Task]] = None
+
+class ScheduleSummary(LazyModel):
+    """Represents the counts of a scheduling result."""
+    locations: int
+    staffs: int
+    newTasks: int
+    currentTasks: int
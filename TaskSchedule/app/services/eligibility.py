@@ -0,0 +1,101 @@
+from typing import Dict, List, Optional, Sequence
+import numpy as np
+from app.model.model import Staff, Task
+
+UNLIMITED_TASKS = -1
+BLOCK_SIZE = 1024  # Tasks evaluated at once, bounds the memory of the intermediate task x staff arrays
+
+
+class EligibilityMatrix:
+    """
+    Task x staff feasibility of the tasks of one date, evaluated in one vectorized pass.
+    A task is feasible for a staff member when it fits in their shift after their last task, when they can travel
+    from their last location (their home location before any task) in time, and when they have not reached the
+    maximum number of tasks. Assignment policies read the matrix and `commit` their choices, which only
+    re-evaluates the column of the chosen staff member for the following tasks.
+    """
+
+    def __init__(self, target_date: str, tasks: Sequence[Task], staffs: Sequence[Staff], location_index: Dict[str, int],
+                 travel_times: np.ndarray, assign_max_num_tasks: int, current_tasks: Sequence[Task] = ()):
+        """
+        Build the staff state of the date from the current tasks and evaluate every task against every staff member.
+        `travel_times[i, j]` is the travel time in minutes from location i to location j, its last row and column
+        stand for unknown locations and must be infinite.
+        """
+        self.assign_max_num_tasks = assign_max_num_tasks
+        self.travel_times = travel_times
+        unknown_location = -1
+
+        self.task_start = np.array([task.slot.slotStart for task in tasks], dtype=np.float64)
+        self.task_end = np.array([task.slot.slotEnd for task in tasks], dtype=np.float64)
+        self.task_location = np.array([location_index.get(task.locationId, unknown_location) for task in tasks], dtype=np.int64)
+        self.task_valid = np.array([task.slot.startDate == target_date and task.slot.endDate == target_date for task in tasks], dtype=bool)
+        self.task_valid &= self.task_location != unknown_location
+
+        # Staff without a shift on the date keep an empty [0, 0] slot, which no task fits in
+        shifts = [next((slot for slot in staff.availableDateShiftSlots if slot.startDate == target_date), None) for staff in staffs]
+        self.available_start = np.array([shift.slotStart if shift else 0 for shift in shifts], dtype=np.float64)
+        self.shift_end = np.array([shift.slotEnd if shift else 0 for shift in shifts], dtype=np.float64)
+        self.staff_location = np.array([location_index.get(staff.locationId, unknown_location) for staff in staffs], dtype=np.int64)
+        self.task_count = np.zeros(len(staffs), dtype=np.int64)
+
+        # Staff members who already have tasks on the date start from the end and location of their latest task
+        staff_position = {}
+        for position, staff in enumerate(staffs):
+            staff_position.setdefault(staff.staffId, position)
+        latest_tasks: Dict[int, Task] = {}
+        for task in current_tasks:
+            position = staff_position.get(task.assignedStaffId)
+            if position is None or task.slot.startDate != target_date:
+                continue
+            self.task_count[position] += 1
+            if position not in latest_tasks or task.slot.slotEnd > latest_tasks[position].slot.slotEnd:
+                latest_tasks[position] = task
+        for position, task in latest_tasks.items():
+            self.available_start[position] = task.slot.slotEnd
+            self.staff_location[position] = location_index.get(task.locationId, unknown_location)
+
+        self.feasible = np.zeros((len(tasks), len(staffs)), dtype=bool)
+        for block_start in range(0, len(tasks), BLOCK_SIZE):
+            rows = slice(block_start, block_start + BLOCK_SIZE)
+            self.feasible[rows] = self.evaluate(rows, slice(None))
+
+    def evaluate(self, task_rows, staff_columns) -> np.ndarray:
+        """Evaluate the feasibility of the selected tasks (rows) for the selected staff members (columns)."""
+        task_start = self.task_start[task_rows][:, None]
+        available_start = self.available_start[staff_columns][None, :]
+        travel_time = self.travel_times[self.staff_location[staff_columns][None, :], self.task_location[task_rows][:, None]]
+        feasible = (
+            self.task_valid[task_rows][:, None]
+            & (available_start <= task_start)
+            & (self.shift_end[staff_columns][None, :] >= self.task_end[task_rows][:, None])
+            & (travel_time + available_start <= task_start)
+        )
+        if self.assign_max_num_tasks != UNLIMITED_TASKS:
+            feasible &= (self.task_count[staff_columns] < self.assign_max_num_tasks)[None, :]
+        return feasible
+
+    def first_eligible(self, task_row: int) -> Optional[int]:
+        """Return the position of the first feasible staff member for the task, or None."""
+        row = self.feasible[task_row]
+        staff_column = int(row.argmax())
+        return staff_column if row[staff_column] else None
+
+    def commit(self, task_row: int, staff_column: int):
+        """Assign the task to the staff member and re-evaluate their column for the following tasks."""
+        self.available_start[staff_column] = self.task_end[task_row]
+        self.staff_location[staff_column] = self.task_location[task_row]
+        self.task_count[staff_column] += 1
+        self.feasible[task_row, :] = False
+        following = slice(task_row + 1, None)
+        self.feasible[following, staff_column] = self.evaluate(following, [staff_column])[:, 0]
+
+    def assign_greedy(self) -> List[Optional[int]]:
+        """Assign each task, in order, to the first feasible staff member. Returns the staff position of each task."""
+        assignments = []
+        for task_row in range(len(self.task_start)):
+            staff_column = self.first_eligible(task_row)
+            if staff_column is not None:
+                self.commit(task_row, staff_column)
+            assignments.append(staff_column)
+        return assignments
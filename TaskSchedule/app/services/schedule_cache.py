@@ -0,0 +1,85 @@
+from collections import OrderedDict
+import time
+from typing import Dict, List, Optional
+import uuid
+from app.model.model import Location, ScheduleSummary, Staff, Task
+
+SCHEDULE_FIELDS = ("newTasks", "locations", "currentTasks", "staffs", "summary")
+DEFAULT_FIELDS = ("newTasks", "locations", "currentTasks", "staffs")
+PAGINATED_FIELDS = ("newTasks", "currentTasks")
+
+
+class CachedSchedule:
+    """Holds a scheduling result serialized once, so that projections and later pages are cheap."""
+
+    def __init__(self, locations: List[Location], newTasks: List[Task], currentTasks: List[Task], staffs: List[Staff]):
+        """Serialize the scheduling result and compute its summary."""
+        self.scheduleId = str(uuid.uuid4())
+        self.created_at = time.monotonic()
+        self.data = {
+            "locations": [location.model_dump(mode="json") for location in locations],
+            "newTasks": [task.model_dump(mode="json") for task in newTasks],
+            "currentTasks": [task.model_dump(mode="json") for task in currentTasks],
+            "staffs": [staff.model_dump(mode="json") for staff in staffs],
+        }
+        self.data["summary"] = ScheduleSummary(
+            locations=len(locations),
+            staffs=len(staffs),
+            newTasks=len(newTasks),
+            currentTasks=len(currentTasks),
+        ).model_dump()
+
+    def project(self, fields: List[str], offset: int = 0, limit: Optional[int] = None) -> Dict:
+        """
+        Build a response containing only the requested fields.
+        When a limit is given, the task lists are paginated from the offset and `nextOffset` is the offset
+        of the following page, or None when every requested task list is exhausted.
+        """
+        response = {"scheduleId": self.scheduleId}
+        next_offset = None
+        for field in fields:
+            values = self.data[field]
+            if field in PAGINATED_FIELDS and limit is not None:
+                if offset + limit < len(values):
+                    next_offset = offset + limit
+                values = values[offset:offset + limit]
+            response[field] = values
+        if limit is not None:
+            response["nextOffset"] = next_offset
+        return response
+
+
+class ScheduleCache:
+    """In-memory LRU cache of scheduling results with a time to live."""
+
+    def __init__(self, max_entries: int = 32, ttl_seconds: float = 600):
+        """Initialize an empty cache."""
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.entries: "OrderedDict[str, CachedSchedule]" = OrderedDict()
+
+    def put(self, schedule: CachedSchedule) -> CachedSchedule:
+        """Store a scheduling result, evicting the least recently used entries over capacity."""
+        self.evict_expired()
+        self.entries[schedule.scheduleId] = schedule
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+        return schedule
+
+    def get(self, schedule_id: str) -> Optional[CachedSchedule]:
+        """Return the cached scheduling result, or None if it is unknown or expired."""
+        self.evict_expired()
+        schedule = self.entries.get(schedule_id)
+        if schedule is not None:
+            self.entries.move_to_end(schedule_id)
+        return schedule
+
+    def evict_expired(self):
+        """Remove the entries older than the time to live."""
+        now = time.monotonic()
+        expired = [key for key, schedule in self.entries.items() if now - schedule.created_at > self.ttl_seconds]
+        for key in expired:
+            del self.entries[key]
+
+
+schedule_cache = ScheduleCache()
@@ -1,13 +1,17 @@
 from app.model.model import ConfigFaker, Location, Staff, Task, Slot, StaffState
 from app.utils.logger import logger
-from geopy.distance import geodesic
-from typing import List
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple
+
+if TYPE_CHECKING:
+    import numpy as np
 
 class TaskScheduler():
     """Handles the task scheduling process."""
     
     def __init__(self, config: ConfigFaker, locations: List[Location], newTasks: List[Task], staffs: List[Staff]):
         """Initialize data for task scheduling: locations, tasks, staffs, and current tasks."""
+        from geopy.distance import geodesic  # Imported lazily, geopy pulls in every geocoder on import
+        self.geodesic = geodesic
         self.assign_max_num_tasks = config.current_task.assign_max_num_tasks
         self.transition_velocity = config.staffs.transition_velocity
         
@@ -19,14 +23,63 @@ class TaskScheduler():
     def assign_tasks_to_staff(self):
         """
         Assigns tasks to staff based on their availability, location, and current tasks.
+        The tasks of each date are evaluated against every staff member at once in an `EligibilityMatrix`,
+        and each task, in order, goes to the first eligible staff member.
         """
-        for task in self.newTasks[:]:  # Use a slice to iterate, as we'll be modifying the list
-            assigned_staff = self.find_eligible_staff(task)
+        from app.services.eligibility import EligibilityMatrix  # Imported lazily with numpy, keeps the app import fast
+        location_index, travel_times = self.build_travel_times()
+        task_positions_by_date: Dict[str, List[int]] = {}
+        for position, task in enumerate(self.newTasks):
+            task_positions_by_date.setdefault(task.slot.startDate, []).append(position)
+
+        assigned_staffs: Dict[int, Staff] = {}
+        for target_date, positions in task_positions_by_date.items():
+            matrix = EligibilityMatrix(target_date, [self.newTasks[position] for position in positions], self.staffs,
+                                       location_index, travel_times, self.assign_max_num_tasks, self.currentTasks)
+            for position, staff_position in zip(positions, matrix.assign_greedy()):
+                if staff_position is not None:
+                    assigned_staffs[position] = self.staffs[staff_position]
+
+        unassigned_tasks = []
+        for position, task in enumerate(self.newTasks):
+            assigned_staff = assigned_staffs.get(position)
             if assigned_staff:
                 task.assignedStaffId = assigned_staff.staffId
                 task.taskAssignmentStatus = "SCHEDULED"
                 self.currentTasks.append(task)
-                self.newTasks.remove(task)
+            else:
+                unassigned_tasks.append(task)
+        self.newTasks[:] = unassigned_tasks
+
+    def build_travel_times(self, tasks: Optional[List[Task]] = None) -> Tuple[Dict[str, int], "np.ndarray"]:
+        """
+        Index the locations of the staff, current tasks and `tasks` (the new tasks by default) and compute the travel
+        time in minutes the eligibility matrix reads: from each of them to each task location. The distance is
+        symmetric, so each pair is only computed once. The extra last row and column stand for unknown locations
+        and are infinite, so they are never reachable.
+        """
+        import numpy as np
+        tasks = self.newTasks if tasks is None else tasks
+        locations = {location.locationId: location for location in self.locations}
+        destinations = {task.locationId for task in tasks} & locations.keys()
+        origins = ({staff.locationId for staff in self.staffs} | {task.locationId for task in self.currentTasks}
+                   | destinations) & locations.keys()
+        location_index = {location_id: index for index, location_id in enumerate(sorted(origins))}
+
+        travel_times = np.full((len(location_index) + 1, len(location_index) + 1), np.inf)
+        for end_id in destinations:
+            end_index = location_index[end_id]
+            for start_id in origins:
+                start_index = location_index[start_id]
+                if start_index == end_index:
+                    travel_times[start_index, end_index] = 0.0
+                elif np.isinf(travel_times[start_index, end_index]):  # Not computed yet as the reverse pair
+                    try:
+                        travel_time = self.calculate_travel_time_mins(locations[start_id], locations[end_id])
+                        travel_times[start_index, end_index] = travel_times[end_index, start_index] = travel_time
+                    except Exception:
+                        pass  # Already logged, the pair stays unreachable
+        return location_index, travel_times
 
     def find_eligible_staff(self, task: Task) -> Staff:
         """
@@ -107,7 +160,7 @@ class TaskScheduler():
     def calculate_travel_time_mins(self, start_location: Location, end_location: Location) -> float:
         """Calculates the travel time between two locations in minutes."""
         try:
-            distance = geodesic(
+            distance = self.geodesic(
                 (start_location.latitude, start_location.longitude),
                 (end_location.latitude, end_location.longitude)
             ).kilometers
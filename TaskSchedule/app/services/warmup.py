@@ -0,0 +1,49 @@
+import json
+import time
+from app.model import model
+from app.model.model import ConfigFaker, LazyModel
+from app.utils.compression import ZSTD_AVAILABLE, zstd_compress
+from app.utils.logger import logger
+from app.services.data_generator import DataGenerator
+from app.services.task_scheduler import TaskScheduler
+from app.services.schedule_cache import CachedSchedule
+
+# Small configuration covering every code path of a /schedule request
+WARMUP_CONFIG = {
+    "start_end_date": ["2024-01-01", "2024-01-01"],
+    "location": {"random_range": [2, 2]},
+    "new_task": {"random_range": [5, 5], "slot_start_range": [540, 1200], "slot_duration": 60},
+    "staffs": {"random_range": [2, 2], "shift_choice": [[540, 1200]], "transition_velocity": 200000},
+    "current_task": {"assign_max_num_tasks": 3},
+}
+
+
+def warm_up_models():
+    """Build the validators and serializers of every model deferred at import time."""
+    for value in vars(model).values():
+        if isinstance(value, type) and issubclass(value, LazyModel) and value is not LazyModel:
+            value.model_rebuild()
+
+
+def warm_up() -> float:
+    """
+    Pre-build models, imports and caches used by the first requests by scheduling a small configuration.
+    The result is not stored in the schedule cache. Returns the warm-up time in milliseconds.
+    """
+    started = time.perf_counter()
+    warm_up_models()
+    import yaml
+    config = ConfigFaker(**yaml.safe_load(json.dumps(WARMUP_CONFIG)))
+    data_generator = DataGenerator(config)
+    locations = data_generator.generate_locations()
+    newTasks = data_generator.generate_new_tasks(locations)
+    staffs = data_generator.generate_staffs(locations)
+    scheduler = TaskScheduler(config, locations, newTasks, staffs)
+    scheduler.assign_tasks_to_staff()
+    schedule = CachedSchedule(scheduler.locations, scheduler.newTasks, scheduler.currentTasks, scheduler.staffs)
+    body = json.dumps(schedule.project(["newTasks", "locations", "currentTasks", "staffs", "summary"])).encode()
+    if ZSTD_AVAILABLE:
+        zstd_compress(body, level=3)
+    elapsed_ms = (time.perf_counter() - started) * 1000
+    logger.info(f"Warm-up finished in {elapsed_ms:.1f} ms")
+    return elapsed_ms
@@ -0,0 +1,119 @@
+import importlib
+import importlib.util
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.middleware.gzip import GZipMiddleware
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+
+# zstd is optional, gzip is always available. The module is only imported on the first zstd response.
+ZSTD_AVAILABLE = importlib.util.find_spec("zstandard") is not None
+
+
+def zstd_compress(body: bytes, level: int) -> bytes:
+    """Compresses a body with zstd, importing `zstandard` on first use."""
+    zstandard = importlib.import_module("zstandard")
+    return zstandard.ZstdCompressor(level=level).compress(body)
+
+
+def parse_accept_encoding(header: str) -> dict:
+    """Parses an Accept-Encoding header into a mapping of coding -> quality."""
+    codings = {}
+    for item in header.split(","):
+        coding, *params = item.split(";")
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+        quality = 1.0
+        for param in params:
+            name, _, value = param.partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    quality = float(value.strip())
+                except ValueError:
+                    quality = 0.0
+        codings[coding] = quality
+    return codings
+
+
+def coding_quality(codings: dict, coding: str) -> float:
+    """Quality of a coding, codings not listed get the quality of `*` or 0."""
+    return codings.get(coding, codings.get("*", 0.0))
+
+
+class CompressionMiddleware:
+    """
+    Negotiates the response encoding from the Accept-Encoding header.
+    zstd is used when the client accepts it with a quality at least that of gzip and `zstandard` is installed,
+    otherwise gzip is used when accepted. A coding refused with q=0 is never used.
+    """
+
+    def __init__(self, app: ASGIApp, minimum_size: int = 1000, zstd_level: int = 3, gzip_level: int = 6):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.zstd_level = zstd_level
+        self.gzip = GZipMiddleware(app, minimum_size=minimum_size, compresslevel=gzip_level)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        codings = parse_accept_encoding(Headers(scope=scope).get("Accept-Encoding", ""))
+        zstd_quality = coding_quality(codings, "zstd")
+        gzip_quality = coding_quality(codings, "gzip")
+        if ZSTD_AVAILABLE and zstd_quality > 0 and zstd_quality >= gzip_quality:
+            responder = ZstdResponder(self.app, self.minimum_size, self.zstd_level)
+            await responder(scope, receive, send)
+        elif gzip_quality > 0:
+            await self.gzip(scope, receive, send)
+        else:
+            await self.app(scope, receive, send)  # Every coding refused, the response is sent as is
+
+
+class ZstdResponder:
+    """Buffers the response body and sends it zstd compressed when it is large enough."""
+
+    def __init__(self, app: ASGIApp, minimum_size: int, level: int):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.level = level
+        self.send: Send = None
+        self.initial_message: Message = {}
+        self.content_encoding_set = False
+        self.started = False
+        self.chunks = []
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        self.send = send
+        await self.app(scope, receive, self.send_with_zstd)
+
+    async def send_with_zstd(self, message: Message) -> None:
+        message_type = message["type"]
+        if message_type == "http.response.start":
+            # Hold the start message until the final body size is known.
+            self.initial_message = message
+            self.content_encoding_set = "content-encoding" in Headers(raw=message["headers"])
+            return
+        if message_type != "http.response.body":
+            await self.send(message)
+            return
+        if self.content_encoding_set:
+            if not self.started:
+                self.started = True
+                await self.send(self.initial_message)
+            await self.send(message)
+            return
+
+        self.chunks.append(message.get("body", b""))
+        if message.get("more_body", False):
+            return
+
+        body = b"".join(self.chunks)
+        if len(body) >= self.minimum_size:
+            body = zstd_compress(body, self.level)
+            headers = MutableHeaders(raw=self.initial_message["headers"])
+            headers["Content-Encoding"] = "zstd"
+            headers["Content-Length"] = str(len(body))
+            headers.add_vary_header("Accept-Encoding")
+        self.started = True
+        await self.send(self.initial_message)
+        await self.send({"type": "http.response.body", "body": body, "more_body": False})
@@ -1,10 +1,13 @@
-import yaml
+import base64
+import json
+from typing import List, Optional, Sequence
 from fastapi import Request, HTTPException
 from app.model.model import ConfigFaker
 from app.utils.logger import logger
 
 async def get_config_data(request: Request) -> ConfigFaker:
     """Parses and validates the configuration data from the request body."""
+    import yaml  # Imported lazily to keep the application import fast
     try:
         body = await request.body()
         config_yaml = yaml.safe_load(body)
@@ -20,3 +23,35 @@ async def get_config_data(request: Request) -> ConfigFaker:
     except Exception as e:
         logger.error(str(e))
         raise HTTPException(status_code=400, detail=str(e))
+
+def parse_fields(fields: Optional[str], allowed: Sequence[str], default: Sequence[str]) -> List[str]:
+    """Parses a comma-separated field projection, e.g. `currentTasks,summary`."""
+    if not fields:
+        return list(default)
+    requested = [field.strip() for field in fields.split(",") if field.strip()]
+    unknown = [field for field in requested if field not in allowed]
+    if unknown or not requested:
+        detail = f"Unknown fields: {', '.join(unknown)}. Allowed fields: {', '.join(allowed)}."
+        logger.error(detail)
+        raise HTTPException(status_code=400, detail=detail)
+    return list(dict.fromkeys(requested))
+
+def encode_cursor(schedule_id: str, offset: int) -> str:
+    """Encodes an opaque pagination cursor for a cached schedule."""
+    payload = json.dumps({"scheduleId": schedule_id, "offset": offset}).encode()
+    return base64.urlsafe_b64encode(payload).decode().rstrip("=")
+
+def decode_cursor(cursor: str, schedule_id: str) -> int:
+    """Decodes a pagination cursor and returns its offset within the given schedule."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        offset = int(payload["offset"])
+        cursor_schedule_id = payload["scheduleId"]
+    except Exception:
+        logger.error(f"Invalid cursor: {cursor}")
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    if cursor_schedule_id != schedule_id or offset < 0:
+        logger.error(f"Cursor does not belong to schedule {schedule_id}")
+        raise HTTPException(status_code=400, detail="Cursor does not belong to this schedule")
+    return offset
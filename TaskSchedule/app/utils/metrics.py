@@ -0,0 +1,78 @@
+from collections import deque
+import time
+from typing import Deque, Dict, Optional
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+
+def percentile(values, q: float) -> Optional[float]:
+    """Returns the q-th percentile (0-100) of the values with the nearest-rank method."""
+    ordered = sorted(values)
+    if not ordered:
+        return None
+    rank = max(1, -(-len(ordered) * q // 100))
+    return ordered[int(rank) - 1]
+
+
+class LatencyReport:
+    """Collects the import time, the warm-up time and the per-route request latencies of the application."""
+
+    def __init__(self, max_samples: int = 1000):
+        """Initialize an empty report keeping the latest `max_samples` latencies of each route."""
+        self.max_samples = max_samples
+        self.import_ms: Optional[float] = None
+        self.warmup_ms: Optional[float] = None
+        self.first_request_ms: Dict[str, float] = {}
+        self.samples: Dict[str, Deque[float]] = {}
+        self.counts: Dict[str, int] = {}
+
+    def record_request(self, route: str, elapsed_ms: float):
+        """Record the latency of a request, the first one of each route is kept apart."""
+        if route not in self.first_request_ms:
+            self.first_request_ms[route] = elapsed_ms
+            self.samples[route] = deque(maxlen=self.max_samples)
+            self.counts[route] = 0
+        self.samples[route].append(elapsed_ms)
+        self.counts[route] += 1
+
+    def report(self) -> Dict:
+        """Return the cold start and latency figures in milliseconds."""
+        return {
+            "importTimeMs": self.import_ms,
+            "warmupTimeMs": self.warmup_ms,
+            "routes": {
+                route: {
+                    "count": self.counts[route],
+                    "firstRequestMs": self.first_request_ms[route],
+                    "p50Ms": percentile(samples, 50),
+                    "p99Ms": percentile(samples, 99),
+                }
+                for route, samples in self.samples.items()
+            },
+        }
+
+
+latency_report = LatencyReport()
+
+
+class LatencyMiddleware:
+    """Measures the time until the last body message of each HTTP response is sent."""
+
+    def __init__(self, app: ASGIApp, report: LatencyReport = latency_report):
+        self.app = app
+        self.report = report
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        started = time.perf_counter()
+
+        async def send_with_timing(message: Message) -> None:
+            await send(message)
+            if message["type"] == "http.response.body" and not message.get("more_body", False):
+                route = scope.get("route")
+                # Unmatched paths are not recorded to keep the report bounded
+                if route is not None:
+                    self.report.record_request(f"{scope['method']} {route.path}", (time.perf_counter() - started) * 1000)
+
+        await self.app(scope, receive, send_with_timing)
@@ -0,0 +1,71 @@
+"""
+Per-day cost of the task assignment at 10k tasks x 5k staff.
+
+Run from the TaskSchedule directory:
+    python -m benchmarks.benchmark_eligibility --tasks 10000 --staffs 5000
+
+Many locations with few tasks, where the travel times must only cover the locations in use:
+    python -m benchmarks.benchmark_eligibility --tasks 20 --staffs 20 --locations 400
+"""
+import argparse
+import time
+from app.model.model import ConfigFaker, CurrentTaskConfig, LocationConfig, NewTaskConfig, StaffConfig
+from app.services.data_generator import DataGenerator
+from app.services.eligibility import EligibilityMatrix
+from app.services.task_scheduler import TaskScheduler
+
+DATE = "2024-01-01"
+
+
+def build_scheduler(num_tasks: int, num_staffs: int, num_locations: int) -> TaskScheduler:
+    """Generate one day of tasks and staff."""
+    config = ConfigFaker(
+        start_end_date=[DATE, DATE],
+        location=LocationConfig(random_range=[num_locations, num_locations]),
+        new_task=NewTaskConfig(random_range=[num_tasks, num_tasks], slot_start_range=[480, 1080], slot_duration=60),
+        current_task=CurrentTaskConfig(assign_max_num_tasks=4),
+        staffs=StaffConfig(random_range=[num_staffs, num_staffs], shift_choice=[[480, 960], [720, 1200]], transition_velocity=30)
+    )
+    data_generator = DataGenerator(config)
+    locations = data_generator.generate_locations()
+    newTasks = data_generator.generate_new_tasks(locations)
+    staffs = data_generator.generate_staffs(locations)
+    return TaskScheduler(config, locations, newTasks, staffs)
+
+
+def timed(function, *args):
+    started = time.perf_counter()
+    result = function(*args)
+    return result, (time.perf_counter() - started) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the batched eligibility evaluation of one day.')
+    parser.add_argument('--tasks', type=int, default=10000)
+    parser.add_argument('--staffs', type=int, default=5000)
+    parser.add_argument('--locations', type=int, default=50)
+    parser.add_argument('--per-task-sample', type=int, default=20, help='Tasks evaluated one by one to estimate the per-task cost')
+    args = parser.parse_args()
+
+    scheduler = build_scheduler(args.tasks, args.staffs, args.locations)
+    (location_index, travel_times), travel_ms = timed(scheduler.build_travel_times)
+    matrix, matrix_ms = timed(EligibilityMatrix, DATE, scheduler.newTasks, scheduler.staffs, location_index,
+                              travel_times, scheduler.assign_max_num_tasks, scheduler.currentTasks)
+    assignments, greedy_ms = timed(matrix.assign_greedy)
+
+    # The per-task evaluation re-derives every staff state for every task, only a sample of it is timed
+    sample = scheduler.newTasks[:args.per_task_sample]
+    _, per_task_ms = timed(lambda: [scheduler.find_eligible_staff(task) for task in sample])
+    per_task_ms /= max(len(sample), 1)
+
+    print(f'{len(scheduler.newTasks)} tasks x {len(scheduler.staffs)} staff, {len(scheduler.locations)} locations')
+    print(f'  travel times:        {travel_ms:10.1f} ms')
+    print(f'  eligibility matrix:  {matrix_ms:10.1f} ms')
+    print(f'  greedy assignment:   {greedy_ms:10.1f} ms ({sum(a is not None for a in assignments)} assigned)')
+    print(f'  batched per day:     {travel_ms + matrix_ms + greedy_ms:10.1f} ms')
+    print(f'  per-task evaluation: {per_task_ms:10.1f} ms per task, ~{per_task_ms * len(scheduler.newTasks) / 1000:.0f} s per day '
+          f'before any task is assigned')
+
+
+if __name__ == '__main__':
+    main()
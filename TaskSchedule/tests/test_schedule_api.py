@@ -0,0 +1,149 @@
+import subprocess
+import sys
+import unittest
+from unittest.mock import patch
+from fastapi.testclient import TestClient
+from app.main import app
+from app.utils.compression import parse_accept_encoding
+
+CONFIG_YAML = """
+start_end_date: ["2024-01-01", "2024-01-02"]
+location:
+  random_range: [2, 3]
+new_task:
+  random_range: [20, 30]
+  slot_start_range: [540, 1200]
+  slot_duration: 60
+staffs:
+  random_range: [5, 10]
+  shift_choice: [[540, 1200], [540, 1080]]
+  transition_velocity: 200000
+current_task:
+  assign_max_num_tasks: 3
+"""
+
+class TestScheduleApi(unittest.TestCase):
+
+    def setUp(self):
+        self.client = TestClient(app)
+
+    def post_schedule(self, params=None, headers=None):
+        return self.client.post("/schedule", params=params, content=CONFIG_YAML,
+                                headers={"Content-Type": "text/yaml", **(headers or {})})
+
+    def test_schedule_default_fields(self):
+        """Test that the default response keeps every list of the schedule."""
+        response = self.post_schedule()
+        self.assertEqual(response.status_code, 200)
+        body = response.json()
+        for field in ["newTasks", "locations", "currentTasks", "staffs", "scheduleId"]:
+            self.assertIn(field, body)
+        self.assertNotIn("nextCursor", body)
+
+    def test_schedule_field_projection(self):
+        """Test that only the requested fields are returned."""
+        response = self.post_schedule(params={"fields": "currentTasks,summary"})
+        self.assertEqual(response.status_code, 200)
+        body = response.json()
+        self.assertEqual(set(body), {"scheduleId", "currentTasks", "summary"})
+        self.assertEqual(body["summary"]["currentTasks"], len(body["currentTasks"]))
+
+    def test_schedule_unknown_field(self):
+        """Test that unknown fields are rejected."""
+        with patch("app.main.TaskScheduler") as mock_scheduler:
+            response = self.post_schedule(params={"fields": "currentTasks,unknown"})
+        self.assertEqual(response.status_code, 400)
+        mock_scheduler.assert_not_called()  # Rejected before scheduling
+
+    def test_schedule_pagination(self):
+        """Test that following the cursors returns every task exactly once, from the cache."""
+        first_page = self.post_schedule(params={"fields": "newTasks,currentTasks,summary", "limit": 7}).json()
+        summary = first_page["summary"]
+        schedule_id = first_page["scheduleId"]
+        task_ids = {"newTasks": [], "currentTasks": []}
+        page = first_page
+        while True:
+            for field in task_ids:
+                self.assertLessEqual(len(page[field]), 7)
+                task_ids[field].extend(task["taskId"] for task in page[field])
+            if page["nextCursor"] is None:
+                break
+            response = self.client.get(f"/schedule/{schedule_id}",
+                                       params={"fields": "newTasks,currentTasks", "cursor": page["nextCursor"], "limit": 7})
+            self.assertEqual(response.status_code, 200)
+            page = response.json()
+        for field in task_ids:
+            self.assertEqual(len(task_ids[field]), summary[field])
+            self.assertEqual(len(set(task_ids[field])), summary[field])
+
+    def test_schedule_invalid_cursor(self):
+        """Test that cursors of another schedule or garbage cursors are rejected."""
+        first = self.post_schedule(params={"limit": 1}).json()
+        second = self.post_schedule(params={"limit": 1}).json()
+        response = self.client.get(f"/schedule/{second['scheduleId']}", params={"cursor": first["nextCursor"], "limit": 1})
+        self.assertEqual(response.status_code, 400)
+        response = self.client.get(f"/schedule/{second['scheduleId']}", params={"cursor": "not-a-cursor", "limit": 1})
+        self.assertEqual(response.status_code, 400)
+
+    def test_get_unknown_schedule(self):
+        """Test that an unknown or expired schedule returns 404."""
+        response = self.client.get("/schedule/unknown")
+        self.assertEqual(response.status_code, 404)
+
+    def test_schedule_compression(self):
+        """Test that zstd is preferred when accepted and gzip is used otherwise."""
+        response = self.post_schedule(headers={"Accept-Encoding": "gzip, zstd"})
+        self.assertEqual(response.headers["content-encoding"], "zstd")
+        self.assertIn("scheduleId", response.json())
+
+        response = self.post_schedule(headers={"Accept-Encoding": "gzip, zstd;q=0"})
+        self.assertEqual(response.headers["content-encoding"], "gzip")
+        self.assertIn("scheduleId", response.json())
+
+        response = self.post_schedule(headers={"Accept-Encoding": "zstd;q=0.1, gzip;q=1.0"})
+        self.assertEqual(response.headers["content-encoding"], "gzip")
+
+        response = self.post_schedule(headers={"Accept-Encoding": "zstd;q=0.5, *;q=0.5"})
+        self.assertEqual(response.headers["content-encoding"], "zstd")
+
+        # Refused codings are never used, the response is sent uncompressed
+        for accept_encoding in ["gzip;q=0", "zstd;q=0, gzip;q=0"]:
+            response = self.post_schedule(headers={"Accept-Encoding": accept_encoding})
+            self.assertNotIn("content-encoding", response.headers)
+            self.assertIn("scheduleId", response.json())
+
+        with patch("app.utils.compression.ZSTD_AVAILABLE", False):
+            response = self.post_schedule(headers={"Accept-Encoding": "zstd, gzip;q=0"})
+            self.assertNotIn("content-encoding", response.headers)
+            response = self.post_schedule(headers={"Accept-Encoding": "zstd, gzip;q=0.5"})
+            self.assertEqual(response.headers["content-encoding"], "gzip")
+
+    def test_parse_accept_encoding(self):
+        """Test that every parameter of a coding is parsed and only q sets its quality."""
+        self.assertEqual(parse_accept_encoding("gzip;q=0.5;level=1, ZSTD ; q=0.8, br"),
+                         {"gzip": 0.5, "zstd": 0.8, "br": 1.0})
+        self.assertEqual(parse_accept_encoding("gzip;level=1;q=0.2, zstd;q=bad"), {"gzip": 0.2, "zstd": 0.0})
+
+    def test_startup_warm_up_and_metrics(self):
+        """Test that the startup warm-up runs and that the first-request latency is reported."""
+        with TestClient(app) as client:
+            self.assertEqual(client.post("/schedule", params={"fields": "summary"}, content=CONFIG_YAML,
+                                         headers={"Content-Type": "text/yaml"}).status_code, 200)
+            report = client.get("/metrics/startup").json()
+        self.assertGreater(report["importTimeMs"], 0)
+        self.assertGreater(report["warmupTimeMs"], 0)
+        route = report["routes"]["POST /schedule"]
+        self.assertGreaterEqual(route["count"], 1)
+        self.assertGreater(route["firstRequestMs"], 0)
+        self.assertGreater(route["p99Ms"], 0)
+
+    def test_app_import_defers_heavy_modules(self):
+        """Test that importing the app does not import geopy and numpy, they are loaded by the warm-up."""
+        result = subprocess.run(
+            [sys.executable, "-c", "import sys, app.main; print(sorted({'geopy', 'numpy', 'yaml'} & set(sys.modules)))"],
+            capture_output=True, text=True, check=True,
+        )
+        self.assertEqual(result.stdout.strip(), "[]")
+
+if __name__ == '__main__':
+    unittest.main()
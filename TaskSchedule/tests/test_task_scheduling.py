@@ -1,6 +1,8 @@
 import unittest
 from unittest.mock import patch
 from app.model.model import ConfigFaker, Location, Staff, Task, Slot, StaffState, CurrentTaskConfig, StaffConfig, LocationConfig, NewTaskConfig
+from app.services.data_generator import DataGenerator
+from app.services.eligibility import EligibilityMatrix
 from app.services.task_scheduler import TaskScheduler
 
 class TestTaskScheduler(unittest.TestCase):
@@ -117,5 +119,76 @@ class TestTaskScheduler(unittest.TestCase):
         self.assertEqual(staff_state.availableSlot.slotStart, 12)  # After the first task ends
         self.assertEqual(staff_state.availableSlot.slotEnd, 18)
 
+    def test_assign_tasks_matches_per_task_evaluation(self):
+        """Test that the batched eligibility matrix assigns tasks exactly like evaluating each task on its own."""
+        config = ConfigFaker(
+            start_end_date=["2024-01-01", "2024-01-03"],
+            location=LocationConfig(random_range=[4, 6]),
+            new_task=NewTaskConfig(random_range=[150, 200], slot_start_range=[480, 1080], slot_duration=60),
+            current_task=CurrentTaskConfig(assign_max_num_tasks=4),
+            staffs=StaffConfig(random_range=[20, 30], shift_choice=[[480, 960], [720, 1200]], transition_velocity=30)
+        )
+        data_generator = DataGenerator(config)
+        locations = data_generator.generate_locations()
+        newTasks = data_generator.generate_new_tasks(locations)
+        staffs = data_generator.generate_staffs(locations)
+
+        scheduler = TaskScheduler(config, locations, [task.model_copy(deep=True) for task in newTasks], staffs)
+        scheduler.assign_tasks_to_staff()
+
+        reference = TaskScheduler(config, locations, [task.model_copy(deep=True) for task in newTasks], staffs)
+        for task in reference.newTasks[:]:
+            assigned_staff = reference.find_eligible_staff(task)
+            if assigned_staff:
+                task.assignedStaffId = assigned_staff.staffId
+                reference.currentTasks.append(task)
+                reference.newTasks.remove(task)
+
+        self.assertGreater(len(reference.currentTasks), 0)
+        self.assertEqual([(task.taskId, task.assignedStaffId) for task in scheduler.currentTasks],
+                         [(task.taskId, task.assignedStaffId) for task in reference.currentTasks])
+        self.assertEqual([task.taskId for task in scheduler.newTasks], [task.taskId for task in reference.newTasks])
+
+    def test_eligibility_matrix_commit_updates_staff_column(self):
+        """Test that committing a task moves the staff member to the task and only re-evaluates their column."""
+        self.staffs.append(Staff(staffId="staff2", locationId="loc1", availableDateShiftSlots=[
+            Slot(startDate="2024-01-01", endDate="2024-01-01", slotStart=8, slotEnd=18)
+        ]))
+        tasks = [
+            Task(taskId="task1", locationId="loc1", slot=Slot(startDate="2024-01-01", endDate="2024-01-01", slotStart=10, slotEnd=12), taskAssignmentStatus=""),
+            Task(taskId="task3", locationId="loc1", slot=Slot(startDate="2024-01-01", endDate="2024-01-01", slotStart=11, slotEnd=13), taskAssignmentStatus=""),
+            Task(taskId="task4", locationId="unknown", slot=Slot(startDate="2024-01-01", endDate="2024-01-01", slotStart=14, slotEnd=15), taskAssignmentStatus="")
+        ]
+        location_index, travel_times = self.scheduler.build_travel_times()
+        matrix = EligibilityMatrix("2024-01-01", tasks, self.staffs, location_index, travel_times, 3)
+
+        self.assertEqual(matrix.feasible.tolist(), [[True, True], [True, True], [False, False]])
+
+        matrix.commit(0, 0)
+        self.assertEqual(matrix.feasible[1].tolist(), [False, True])  # staff1 is busy until 12
+        self.assertEqual(matrix.first_eligible(1), 1)
+        self.assertIsNone(matrix.first_eligible(2))
+        self.assertEqual(matrix.task_count.tolist(), [1, 0])
+    def test_travel_times_only_cover_used_locations(self):
+        """Test that travel times are only computed between the locations of the staff and tasks, once per pair."""
+        locations = [Location(locationId=f"loc{index}", latitude=10.0 + index / 100, longitude=20.0) for index in range(1, 401)]
+        scheduler = TaskScheduler(config=self.mock_config, locations=locations, newTasks=self.newTasks, staffs=self.staffs)
+        geodesic = scheduler.geodesic
+        calls = []
+        scheduler.geodesic = lambda start, end: calls.append((start, end)) or geodesic(start, end)
+
+        location_index, travel_times = scheduler.build_travel_times()
+
+        # loc1 (staff and task1) and loc2 (task2): only the loc1 <-> loc2 distance is computed
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(set(location_index), {"loc1", "loc2"})
+        self.assertEqual(travel_times.shape, (3, 3))
+        self.assertEqual(travel_times[location_index["loc1"], location_index["loc2"]],
+                         travel_times[location_index["loc2"], location_index["loc1"]])
+        self.assertEqual(travel_times[location_index["loc1"], location_index["loc1"]], 0)
+
+        scheduler.assign_tasks_to_staff()
+        self.assertEqual([task.taskId for task in scheduler.currentTasks], ["task1"])
+
 if __name__ == '__main__':
     unittest.main()